@@ -0,0 +1,238 @@
+"""Batch strip regeneration.
+
+선택된 사진 묶음 목록으로 결과 이미지를 프로세스 풀에서 일괄 생성합니다.
+행사 후 새 프레임 디자인으로 수백 장의 결과를 다시 만들 때 사용합니다.
+
+입력 형식:
+    - ``*.jsonl`` 매니페스트: 한 줄에 ``{"images": [...], "output": "...", "frame": "..."}``
+      (``output``/``frame`` 은 생략 가능, 상대 경로는 매니페스트 위치 기준)
+    - 텍스트 목록: 한 줄에 사진 경로들 (공백 또는 쉼표로 구분, ``#`` 은 주석)
+    - 세션 저장소 디렉터리 (``index.jsonl`` 이 있는 ``captures``): 각 세션의 마지막 선택
+
+사용 예::
+
+    python -m image_processor batch captures --frame party --output-dir reprint
+    python -m image_processor batch selections.jsonl --template 2x2 --workers 8
+
+완료된 작업은 출력 디렉터리의 ``batch_progress.jsonl`` 에 기록되므로 중단 후 같은 명령을
+다시 실행하면 남은 작업만 처리합니다.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set
+
+import cv2
+
+from image_io import EncodeSettings, write_image
+from image_processor import add_frame_to_image, load_image
+from session_store import SessionStore
+from templates import load_template, render_template
+
+PROGRESS_NAME = "batch_progress.jsonl"
+PROGRESS_INTERVAL_S = 1.0
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """결과 이미지 한 장을 만드는 작업.
+
+    Attributes:
+        images: 합성할 사진 경로 (템플릿 슬롯 순서)
+        output: 출력 파일 경로
+        frame: 장식 프레임 이름 또는 경로 (None이면 프레임 없음)
+    """
+
+    images: tuple
+    output: Path
+    frame: Optional[str] = None
+
+
+def _read_manifest(path: Path) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if path.suffix.lower() == ".jsonl":
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{number}: 잘못된 JSON입니다 ({e})")
+            else:
+                yield {"images": [p for p in line.replace(",", " ").split() if p]}
+
+
+def _read_sessions(root: Path) -> Iterator[dict]:
+    store = SessionStore(root)
+    for session in store.sessions():
+        selections = [e["paths"] for e in store.events(session) if e.get("event") == "selection"]
+        if selections:
+            # 같은 세션에서 다시 고른 경우 마지막 선택이 실제 결과 (경로는 저장소 루트 기준)
+            directory = Path(session["path"])
+            yield {"images": [str(directory / p) for p in selections[-1]], "name": session["id"]}
+
+
+def load_jobs(
+    source: Path,
+    output_dir: Path,
+    encoding: EncodeSettings,
+    frame: Optional[str] = None,
+) -> List[BatchJob]:
+    """입력(매니페스트, 목록 또는 세션 저장소)에서 작업 목록을 만듭니다."""
+    if source.is_dir():
+        entries = _read_sessions(source)
+        base = source
+    else:
+        entries = _read_manifest(source)
+        base = source.parent
+
+    jobs = []
+    for number, entry in enumerate(entries, 1):
+        images = tuple(str(base / p) for p in entry["images"])
+        name = entry.get("name") or f"{number:05d}_{Path(images[0]).stem}"
+        output = Path(entry["output"]) if entry.get("output") else Path(f"{name}{encoding.extension}")
+        if not output.is_absolute():
+            output = output_dir / output
+        jobs.append(BatchJob(images, output, entry.get("frame", frame)))
+    return jobs
+
+
+def _load_progress(path: Path) -> Set[str]:
+    done = set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("ok"):
+                    done.add(record["output"])
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def _init_worker():
+    # 프로세스마다 OpenCV 스레드 풀을 쓰면 코어 수 x 코어 수만큼 스레드가 생김
+    cv2.setNumThreads(1)
+
+
+def run_job(job: BatchJob, template_spec: Optional[str], encoding: EncodeSettings) -> bool:
+    """작업 하나를 처리합니다 (작업 프로세스에서 실행)."""
+    template = load_template(template_spec)
+    images = [load_image(Path(p)) for p in job.images]
+    combined = render_template(images, template)
+    if job.frame:
+        return add_frame_to_image(combined, job.frame, job.output, encoding)
+    return write_image(job.output, combined, encoding, durable=True)
+
+
+def run_batch(
+    jobs: Iterable[BatchJob],
+    progress_path: Path,
+    template_spec: Optional[str] = None,
+    encoding: Optional[EncodeSettings] = None,
+    workers: Optional[int] = None,
+    resume: bool = True,
+) -> int:
+    """작업들을 프로세스 풀에서 처리합니다.
+
+    동시에 제출하는 작업 수를 작업자 수의 두 배로 제한해 결과를 순서대로 흘려 보내며,
+    완료될 때마다 진행 기록에 한 줄씩 추가합니다.
+
+    Args:
+        jobs: 작업 목록
+        progress_path: 진행 기록 파일 (재시작 시 완료된 작업 건너뜀)
+        template_spec: 템플릿 이름 또는 JSON 경로
+        encoding: 저장 형식
+        workers: 작업 프로세스 수 (기본: CPU 수)
+        resume: 진행 기록과 출력 파일이 있는 작업 건너뛰기
+
+    Returns:
+        실패한 작업 수
+    """
+    encoding = encoding or EncodeSettings()
+    workers = workers or os.cpu_count() or 1
+    jobs = list(jobs)
+    done = _load_progress(progress_path) if resume else set()
+    pending = [job for job in jobs if not (str(job.output) in done and job.output.exists())]
+    skipped = len(jobs) - len(pending)
+    total = len(pending)
+    if not pending:
+        print(f"Batch: nothing to do ({skipped} already done)")
+        return 0
+    workers = min(workers, total)
+    print(f"Batch: {total} jobs ({skipped} already done), {workers} workers")
+
+    progress_path.parent.mkdir(parents=True, exist_ok=True)
+    failed = 0
+    completed = 0
+    start = last_report = time.perf_counter()
+    queue = iter(pending)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor, \
+            open(progress_path, "a", encoding="utf-8") as progress:
+        running = {}
+
+        def fill():
+            while len(running) < workers * 2:
+                job = next(queue, None)
+                if job is None:
+                    return
+                running[executor.submit(run_job, job, template_spec, encoding)] = job
+
+        fill()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = running.pop(future)
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    print(f"Batch job failed ({job.output.name}): {e}")
+                    ok = False
+                failed += not ok
+                completed += 1
+                progress.write(json.dumps({"output": str(job.output), "ok": ok}, ensure_ascii=False) + "\n")
+                progress.flush()
+            fill()
+
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL_S or not running:
+                last_report = now
+                rate = completed / (now - start)
+                eta = (total - completed) / rate if rate > 0 else 0
+                print(f"[{completed}/{total}] {rate:.1f} jobs/s, {failed} failed, ETA {eta:.0f} s")
+
+    elapsed = time.perf_counter() - start
+    print(f"Batch finished: {completed - failed} ok, {failed} failed in {elapsed:.1f} s ({completed / elapsed:.1f} jobs/s)")
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m image_processor batch", description="Regenerate result images in bulk")
+    parser.add_argument("source", type=Path, help="selection manifest (.jsonl), path list, or session store directory")
+    parser.add_argument("--output-dir", type=Path, default=Path("batch_output"), help="output directory (default: batch_output)")
+    parser.add_argument("--template", default=None, help="layout template name or .json file (default: $PHOTOBOOTH_TEMPLATE or 3cut)")
+    parser.add_argument("--frame", default=None, help="decorative frame name or path applied to every result")
+    parser.add_argument("--format", default="png", help="output encoding: png[:LEVEL], jpeg[:QUALITY], webp[:QUALITY] (default: png)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--no-resume", action="store_true", help="redo jobs recorded as done")
+    args = parser.parse_args(argv)
+
+    encoding = EncodeSettings.from_spec(args.format)
+    jobs = load_jobs(args.source, args.output_dir, encoding, args.frame)
+    failed = run_batch(
+        jobs,
+        args.output_dir / PROGRESS_NAME,
+        template_spec=args.template,
+        encoding=encoding,
+        workers=args.workers,
+        resume=not args.no_resume,
+    )
+    return 1 if failed else 0
@@ -0,0 +1,317 @@
+"""Photo booth performance benchmarks.
+
+화면 없이(Qt offscreen) 실행되는 단계별 벤치마크입니다. 합성 프레임(720p/1080p/4K)과
+``captures/`` 의 샘플 이미지로 다음 단계를 측정합니다.
+
+    combine_vertical / combine_horizontal  ``combine_three_images`` (PNG 저장 포함)
+    compose_vertical                       저장 없이 스트립 합성만
+    add_frame_rgba / add_frame_rgb         ``add_frame_to_image`` (투명도 있는/없는 프레임)
+    capture_encode                         ``cv2.imwrite`` PNG 저장
+    preview                                ``update_frame`` 의 미리보기 변환 (``PreviewRenderer``)
+
+결과는 단계별 지연 시간 백분위수(p50/p90/p99), 처리량, 최대 메모리를 JSON으로 기록하고,
+``compare`` 는 기준 결과 대비 느려지거나 메모리가 늘어난 항목을 표시합니다 (회귀가 있으면
+종료 코드 1).
+
+사용 예::
+
+    python benchmarks/bench.py run --output baseline.json
+    python benchmarks/bench.py run --output current.json --baseline baseline.json
+    python benchmarks/bench.py compare baseline.json current.json --threshold 0.10
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+from PyQt5.QtCore import QSize  # noqa: E402
+from PyQt5.QtGui import QGuiApplication  # noqa: E402
+
+from compositor import StripLayout, compose_strip  # noqa: E402
+from frame_source import PatternSource  # noqa: E402
+from image_processor import add_frame_to_image, combine_three_images  # noqa: E402
+from preview import PreviewRenderer  # noqa: E402
+
+SIZES = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+STAGES = (
+    "combine_vertical",
+    "combine_horizontal",
+    "compose_vertical",
+    "add_frame_rgba",
+    "add_frame_rgb",
+    "capture_encode",
+    "preview",
+)
+PREVIEW_TARGET = QSize(960, 720)  # 1280x800 창의 미리보기 레이블 크기 정도
+DEFAULT_THRESHOLD = 0.10
+# 이보다 작은 절대 변화는 측정 잡음으로 보고 회귀로 표시하지 않음
+MIN_DELTA = {"p50_ms": 0.05, "p90_ms": 0.05, "peak_alloc_mb": 1.0}
+
+
+# ---- Inputs -----------------------------------------------------------------------
+
+
+def synthetic_frames(width: int, height: int, count: int = 3, seed: int = 0) -> List[np.ndarray]:
+    """패턴 소스 프레임에 센서 노이즈를 더해 실제 촬영과 비슷한 압축률의 프레임을 만듭니다."""
+    source = PatternSource(width, height, fps=0)
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        _, frame = source.read()
+        noise = rng.normal(0, 4, frame.shape).astype(np.int16)
+        frames.append(np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def sample_frames(count: int = 3) -> Optional[List[np.ndarray]]:
+    """``captures/`` 의 샘플 이미지 (없으면 None)."""
+    paths = sorted((REPO_ROOT / "captures").glob("capture_*.png"))[:count]
+    if len(paths) < count:
+        return None
+    return [cv2.imread(str(p), cv2.IMREAD_COLOR) for p in paths]
+
+
+def make_frame_assets(directory: Path, width: int, height: int) -> Dict[str, Path]:
+    """결과 크기에 맞춘 RGBA(투명 사진 영역 3개)와 RGB 장식 프레임 파일을 만듭니다."""
+    rgba = np.zeros((height, width, 4), dtype=np.uint8)
+    rgba[:, :, :3] = (40, 90, 200)
+    rgba[:, :, 3] = 255
+    border = max(8, width // 40)
+    cell = (height - 4 * border) // 3
+    for i in range(3):
+        y = border + i * (cell + border)
+        rgba[y:y + cell, border:width - border, 3] = 0
+    # 가장자리 반투명 그림자 (부분 블렌딩 경로)
+    rgba[:, :, 3] = cv2.GaussianBlur(rgba[:, :, 3], (0, 0), border / 3)
+    rgb = np.full((height, width, 3), (230, 200, 120), dtype=np.uint8)
+
+    paths = {"rgba": directory / f"frame_rgba_{width}x{height}.png", "rgb": directory / f"frame_rgb_{width}x{height}.png"}
+    cv2.imwrite(str(paths["rgba"]), rgba)
+    cv2.imwrite(str(paths["rgb"]), rgb)
+    return paths
+
+
+# ---- Measurement --------------------------------------------------------------------
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int, pixels: int) -> Dict[str, float]:
+    """``fn`` 의 지연 시간 분포, 처리량, 최대 메모리를 측정합니다.
+
+    메모리는 타이밍을 왜곡하지 않도록 별도 1회 실행에서 tracemalloc(NumPy 배열 포함)으로
+    측정하고, 프로세스 최대 RSS도 함께 기록합니다.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = np.array(samples)
+    mean_s = ms.mean() / 1000
+    return {
+        "iterations": iterations,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p90_ms": float(np.percentile(ms, 90)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "min_ms": float(ms.min()),
+        "ops_per_s": 1 / mean_s if mean_s > 0 else 0.0,
+        "mpix_per_s": pixels / 1e6 / mean_s if mean_s > 0 else 0.0,
+        "peak_alloc_mb": peak / (1024 * 1024),
+        "max_rss_mb": _max_rss_mb(),
+    }
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KiB, macOS는 바이트 단위
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def stage_functions(frames: List[np.ndarray], workdir: Path) -> Dict[str, Callable[[], object]]:
+    h, w = frames[0].shape[:2]
+    strip_h = sum(f.shape[0] for f in frames)
+    assets = make_frame_assets(workdir, w, strip_h)
+    strip = compose_strip(frames)
+    renderer = PreviewRenderer(PREVIEW_TARGET)
+    out = workdir / "out.png"
+    return {
+        "combine_vertical": lambda: combine_three_images(frames, out, "vertical"),
+        "combine_horizontal": lambda: combine_three_images(frames, out, "horizontal"),
+        "compose_vertical": lambda: compose_strip(frames, StripLayout("vertical")),
+        "add_frame_rgba": lambda: add_frame_to_image(strip, assets["rgba"], out),
+        "add_frame_rgb": lambda: add_frame_to_image(strip, assets["rgb"], out),
+        "capture_encode": lambda: cv2.imwrite(str(workdir / "capture.png"), frames[0]),
+        "preview": lambda: renderer.render(frames[0]),
+    }
+
+
+def run(sizes: List[str], stages: List[str], iterations: int, warmup: int) -> Dict:
+    _app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # QPixmap 생성에 필요
+    results: Dict[str, Dict] = {}
+    # 저장 로그(print)가 결과 출력과 섞이지 않도록 벤치마크 중에는 표준 출력을 버림
+    devnull = open(os.devnull, "w")
+    with tempfile.TemporaryDirectory(prefix="photobooth-bench-") as tmp:
+        for size in sizes:
+            if size == "captures":
+                frames = sample_frames()
+                if frames is None:
+                    print("captures/ 에 샘플 이미지가 3장 미만이라 건너뜁니다.", file=sys.stderr)
+                    continue
+            else:
+                frames = synthetic_frames(*SIZES[size])
+            functions = stage_functions(frames, Path(tmp))
+            pixels = sum(f.shape[0] * f.shape[1] for f in frames)
+            for stage in stages:
+                stage_pixels = frames[0].size // 3 if stage in ("capture_encode", "preview") else pixels
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    result = measure(functions[stage], iterations, warmup, stage_pixels)
+                finally:
+                    sys.stdout = stdout
+                key = f"{stage}@{size}"
+                results[key] = result
+                print(f"{key:28s} p50 {result['p50_ms']:8.2f} ms  p90 {result['p90_ms']:8.2f} ms  "
+                      f"{result['ops_per_s']:7.1f} ops/s  peak {result['peak_alloc_mb']:7.1f} MB", file=sys.stderr)
+    devnull.close()
+    return {"meta": environment(iterations, warmup), "results": results}
+
+
+def environment(iterations: int, warmup: int) -> Dict:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "opencv_threads": cv2.getNumThreads(),
+        "iterations": iterations,
+        "warmup": warmup,
+    }
+
+
+# ---- Comparison ---------------------------------------------------------------------
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """기준 결과 대비 변화를 계산합니다.
+
+    p50/p90 지연 시간이나 최대 메모리가 ``threshold`` 비율 이상, 그리고 ``MIN_DELTA``
+    이상 늘어나면 회귀로 표시합니다.
+
+    Returns:
+        항목별 비교 결과 목록 (``regression`` 이 True면 회귀)
+    """
+    rows = []
+    for key, cur in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        changes = {
+            metric: (cur[metric] - base[metric]) / base[metric] if base[metric] > 0 else 0.0
+            for metric in MIN_DELTA
+        }
+        regression = any(
+            changes[metric] > threshold and cur[metric] - base[metric] >= MIN_DELTA[metric]
+            for metric in MIN_DELTA
+        )
+        rows.append({
+            "key": key,
+            "baseline_p50_ms": base["p50_ms"],
+            "current_p50_ms": cur["p50_ms"],
+            "changes": changes,
+            "regression": regression,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict], threshold: float):
+    for row in rows:
+        changes = row["changes"]
+        flag = "REGRESSION" if row["regression"] else ("faster" if changes["p50_ms"] < -threshold else "ok")
+        print(f"{row['key']:28s} p50 {row['baseline_p50_ms']:8.2f} -> {row['current_p50_ms']:8.2f} ms "
+              f"({changes['p50_ms']:+6.1%})  p90 {changes['p90_ms']:+6.1%}  mem {changes['peak_alloc_mb']:+6.1%}  {flag}")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{len(rows)} compared, {regressions} regression(s) (threshold {threshold:.0%})")
+
+
+def _load(path: Path) -> Dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Photo booth benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run benchmarks and write JSON results")
+    run_parser.add_argument("--sizes", default="720p,1080p,4k,captures", help="comma-separated: 720p, 1080p, 4k, captures")
+    run_parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stage names")
+    run_parser.add_argument("--iterations", type=int, default=20)
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument("--output", type=Path, default=None, help="result JSON path (default: stdout)")
+    run_parser.add_argument("--baseline", type=Path, default=None, help="compare against this result JSON")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    compare_parser = commands.add_parser("compare", help="compare two result JSON files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown ratio (default: 0.10)")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        rows = compare(_load(args.baseline), _load(args.current), args.threshold)
+        print_comparison(rows, args.threshold)
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES and s != "captures"] + [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown size/stage: {', '.join(unknown)}")
+
+    report = run(sizes, stages, args.iterations, args.warmup)
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline is not None:
+        rows = compare(_load(args.baseline), report, args.threshold)
+        print_comparison(rows, args.threshold)
+        return 1 if any(row["regression"] for row in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
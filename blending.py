@@ -0,0 +1,139 @@
+"""Alpha blending engine.
+
+장식 프레임(RGBA) 오버레이를 uint16 고정소수점으로 합성합니다.
+오버레이를 타일 단위로 미리 분류해 완전 투명 영역은 건너뛰고, 완전 불투명 영역은
+복사만 하며, 반투명 영역에서만 실제 블렌딩 연산을 수행합니다.
+"""
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+Span = Tuple[int, int, int, int]  # (y0, y1, x0, x1)
+
+TRANSPARENT, PARTIAL, OPAQUE = 0, 1, 2
+
+
+def _classify_spans(alpha: np.ndarray, tile: int) -> Tuple[List[Span], List[Span]]:
+    """알파를 ``tile`` 크기 타일로 나누어 (불투명 영역, 반투명 영역) 목록을 만듭니다.
+
+    같은 행에서 연속된 같은 종류의 타일은 하나의 영역으로 합칩니다.
+    """
+    h, w = alpha.shape
+    rows, cols = -(-h // tile), -(-w // tile)
+    # 가장자리 타일은 경계 값을 복제해 채워도 min/max 판정이 달라지지 않음
+    padded = np.pad(alpha, ((0, rows * tile - h), (0, cols * tile - w)), mode="edge")
+    tiles = padded.reshape(rows, tile, cols, tile)
+    tile_min = tiles.min(axis=(1, 3))
+    tile_max = tiles.max(axis=(1, 3))
+    kinds = np.full((rows, cols), PARTIAL, dtype=np.uint8)
+    kinds[tile_max == 0] = TRANSPARENT
+    kinds[tile_min == 255] = OPAQUE
+
+    opaque: List[Span] = []
+    partial: List[Span] = []
+    for r in range(rows):
+        y0, y1 = r * tile, min((r + 1) * tile, h)
+        row = kinds[r]
+        # 종류가 바뀌는 지점으로 행을 나눔
+        bounds = np.flatnonzero(np.diff(row)) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [cols]))
+        for c0, c1 in zip(starts, ends):
+            kind = row[c0]
+            if kind == TRANSPARENT:
+                continue
+            span = (y0, y1, int(c0) * tile, min(int(c1) * tile, w))
+            (opaque if kind == OPAQUE else partial).append(span)
+    return opaque, partial
+
+
+class PreparedOverlay:
+    """특정 출력 크기로 미리 준비된 오버레이.
+
+    리사이즈된 BGR, 미리 곱한 색상(premultiplied, uint16), 역알파(uint8)와
+    타일 분류 결과를 보관하므로 같은 크기로 반복 합성할 때 추가 준비 비용이 없습니다.
+
+    Args:
+        overlay: BGRA 또는 BGR 오버레이 이미지
+        size: 출력 크기 (너비, 높이)
+        premultiplied: ``overlay`` 의 색상이 이미 알파와 곱해져 있는지 여부.
+            미리 곱한 오버레이는 4채널을 한 번에 리사이즈해도 가장자리 색이 번지지 않음
+    """
+
+    TILE = 64
+
+    def __init__(self, overlay: np.ndarray, size: Tuple[int, int], tile: int = TILE, premultiplied: bool = False):
+        self.size = size
+        self.has_alpha = overlay.ndim == 3 and overlay.shape[2] == 4
+        needs_resize = (overlay.shape[1], overlay.shape[0]) != size
+
+        if not self.has_alpha:
+            self.bgr = np.ascontiguousarray(cv2.resize(overlay, size) if needs_resize else overlay)
+            return
+
+        if premultiplied:
+            resized = cv2.resize(overlay, size) if needs_resize else overlay
+            color, alpha = resized[:, :, :3], resized[:, :, 3]
+        else:
+            color = cv2.resize(overlay[:, :, :3], size) if needs_resize else overlay[:, :, :3]
+            alpha = cv2.resize(overlay[:, :, 3], size) if needs_resize else overlay[:, :, 3]
+        self.opaque_spans, self.partial_spans = _classify_spans(alpha, tile)
+        # 반투명 영역 연산용: out = (img * (255 - a) + bgr * a) / 255
+        alpha16 = alpha.astype(np.uint16)[:, :, np.newaxis]
+        # 역알파는 uint8로 보관하고 합성할 때 타일 단위로만 uint16으로 넓힘 (캐시 메모리 절감)
+        self.inv_alpha = 255 - alpha[:, :, np.newaxis]
+        # 미리 곱한 오버레이도 불투명 영역에서는 색상이 원래 색상과 같으므로 복사에 그대로 사용
+        self.bgr = np.ascontiguousarray(color)
+        self.premultiplied = self.bgr.astype(np.uint16) * (255 if premultiplied else alpha16)
+
+    @property
+    def nbytes(self) -> int:
+        total = self.bgr.nbytes
+        if self.has_alpha:
+            total += self.inv_alpha.nbytes + self.premultiplied.nbytes
+        return total
+
+    def apply(self, img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """``img`` 위에 오버레이를 합성합니다.
+
+        Args:
+            img: BGR uint8 이미지 (크기는 ``size`` 와 같아야 함)
+            out: 결과를 기록할 배열. ``img`` 자체를 넘기면 제자리 합성
+
+        Returns:
+            합성 결과
+        """
+        if (img.shape[1], img.shape[0]) != self.size:
+            raise ValueError("이미지 크기가 준비된 오버레이 크기와 다릅니다.")
+        if out is None:
+            out = img.copy()
+        elif out is not img:
+            np.copyto(out, img)
+
+        if not self.has_alpha:
+            # 투명도가 없는 경우 단순 오버레이
+            return cv2.addWeighted(out, 0.7, self.bgr, 0.3, 0, dst=out)
+
+        for y0, y1, x0, x1 in self.opaque_spans:
+            out[y0:y1, x0:x1] = self.bgr[y0:y1, x0:x1]
+
+        for y0, y1, x0, x1 in self.partial_spans:
+            acc = out[y0:y1, x0:x1].astype(np.uint16)
+            acc *= self.inv_alpha[y0:y1, x0:x1]
+            acc += self.premultiplied[y0:y1, x0:x1]
+            # x / 255 (반올림)를 정수 연산으로: (x + 128 + ((x + 128) >> 8)) >> 8
+            acc += 128
+            acc += acc >> 8
+            acc >>= 8
+            out[y0:y1, x0:x1] = acc
+        return out
+
+
+def premultiply(overlay: np.ndarray) -> np.ndarray:
+    """BGRA 이미지의 색상을 알파와 미리 곱한 사본을 만듭니다 (반올림)."""
+    out = overlay.copy()
+    alpha = overlay[:, :, 3:4].astype(np.uint16)
+    color = overlay[:, :, :3].astype(np.uint16) * alpha + 127
+    out[:, :, :3] = color // 255
+    return out
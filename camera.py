@@ -0,0 +1,189 @@
+"""Camera capture thread.
+
+GUI 스레드와 분리된 스레드에서 웹캠 프레임을 읽어 미리 할당된 링 버퍼에 기록합니다.
+"""
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from metrics import default_metrics
+
+
+class CaptureThread(threading.Thread):
+    """웹캠을 소유하고 최신 프레임을 링 버퍼에 기록하는 캡처 스레드.
+
+    UI는 ``latest()`` 로 "최신 프레임 + 시퀀스 번호"를 블로킹 없이 가져갑니다.
+    반환된 프레임은 링 슬롯 자체이므로 ``ring_size - 1`` 프레임 동안만 유효합니다.
+    오래 보관해야 하는 경우 ``latest(copy=True)`` 를 사용하세요.
+
+    링에는 각 프레임의 도착 시각(``time.monotonic()``)도 기록되므로 ``frame_near()`` 로
+    최근 ``ring_size - 1`` 프레임 중 특정 시각에 가장 가까운 프레임을 고를 수 있습니다.
+    """
+
+    RING_SIZE = 4
+    FAILURE_SLEEP_S = 0.01  # 읽기 실패 시 바쁜 대기 방지
+    SIGNAL_LOST_FAILURES = 30  # 연속 실패 횟수가 이 값을 넘으면 신호 없음으로 판단
+
+    def __init__(self, capture, ring_size: int = RING_SIZE):
+        super().__init__(name="CaptureThread", daemon=True)
+        if ring_size < 2:
+            raise ValueError("ring_size는 2 이상이어야 합니다.")
+        self.capture = capture
+        self.ring_size = ring_size
+        self._slots: List[Optional[np.ndarray]] = [None] * ring_size
+        self._timestamps = [0.0] * ring_size
+        self._seqs = [0] * ring_size  # 슬롯에 담긴 프레임의 시퀀스 번호 (0이면 비어 있음)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._latest_seq = 0  # 0이면 아직 프레임 없음
+        self._latest_index = -1
+        self._consecutive_failures = 0
+
+    # ---- Worker side --------------------------------------------------------------
+
+    def run(self):
+        metrics = default_metrics()
+        write_index = 0
+        try:
+            while not self._stop_event.is_set():
+                buffer = self._slots[write_index]
+                with metrics.timer("camera.read"):
+                    ok, frame = self.capture.read(buffer) if buffer is not None else self.capture.read()
+                if not ok or frame is None or frame.size == 0:
+                    metrics.count("camera.read_failures")
+                    self._consecutive_failures += 1
+                    time.sleep(self.FAILURE_SLEEP_S)
+                    continue
+
+                self._consecutive_failures = 0
+                if frame is not buffer:
+                    # 첫 프레임이거나 해상도가 바뀐 경우 링 전체를 같은 크기로 재할당
+                    self._allocate_ring(frame, write_index)
+
+                with self._lock:
+                    self._timestamps[write_index] = time.monotonic()
+                    self._latest_index = write_index
+                    self._latest_seq += 1
+                    self._seqs[write_index] = self._latest_seq
+                metrics.tick("camera.frames")
+                write_index = (write_index + 1) % self.ring_size
+        finally:
+            self.capture.release()
+
+    def _allocate_ring(self, frame: np.ndarray, write_index: int):
+        with self._lock:
+            for i in range(self.ring_size):
+                if i == write_index:
+                    self._slots[i] = frame
+                elif self._slots[i] is None or self._slots[i].shape != frame.shape:
+                    self._slots[i] = np.empty_like(frame)
+                else:
+                    continue
+                # 새 버퍼에는 아직 프레임이 없으므로 빈 슬롯으로 표시 (이전 프레임으로 오인하지 않도록)
+                self._seqs[i] = 0
+
+    # ---- Consumer side ------------------------------------------------------------
+
+    def latest(self, copy: bool = False) -> Tuple[int, Optional[np.ndarray]]:
+        """가장 최근 프레임과 시퀀스 번호를 반환합니다 (블로킹 없음).
+
+        Args:
+            copy: True이면 링 슬롯의 복사본을 반환
+
+        Returns:
+            (시퀀스 번호, 프레임). 아직 프레임이 없으면 (0, None)
+        """
+        with self._lock:
+            seq = self._latest_seq
+            index = self._latest_index
+        if index < 0:
+            return 0, None
+        frame = self._slots[index]
+        return seq, frame.copy() if copy else frame
+
+    def frame_near(self, timestamp: float, copy: bool = True) -> Tuple[int, float, Optional[np.ndarray]]:
+        """링에 남아 있는 프레임 중 도착 시각이 ``timestamp`` 에 가장 가까운 프레임을 반환합니다.
+
+        다음에 기록될 슬롯은 후보에서 제외하며, 복사하는 동안 해당 슬롯이 덮어써지면
+        다시 고릅니다.
+
+        Args:
+            timestamp: 기준 시각 (``time.monotonic()``)
+            copy: True이면 링 슬롯의 복사본을 반환
+
+        Returns:
+            (시퀀스 번호, 도착 시각, 프레임). 아직 프레임이 없으면 (0, 0.0, None)
+        """
+        while True:
+            with self._lock:
+                writing = (self._latest_index + 1) % self.ring_size
+                candidates = [i for i in range(self.ring_size) if self._seqs[i] and i != writing]
+                if not candidates:
+                    return 0, 0.0, None
+                index = min(candidates, key=lambda i: abs(self._timestamps[i] - timestamp))
+                seq = self._seqs[index]
+                arrived = self._timestamps[index]
+            frame = self._slots[index]
+            if not copy:
+                return seq, arrived, frame
+            frame = frame.copy()
+            with self._lock:
+                if self._seqs[index] == seq and (self._latest_index + 1) % self.ring_size != index:
+                    return seq, arrived, frame
+
+    def history(self, start: float, end: float) -> List[Tuple[int, float, np.ndarray]]:
+        """도착 시각이 ``start`` ~ ``end`` 사이인 링 프레임을 오래된 순서로 반환합니다 (복사 없음).
+
+        반환된 프레임은 링 슬롯 자체이므로 점수 계산처럼 짧은 작업에만 사용하고,
+        보관할 프레임은 ``copy_frame()`` 으로 복사하세요.
+
+        Returns:
+            [(시퀀스 번호, 도착 시각, 프레임), ...]
+        """
+        with self._lock:
+            writing = (self._latest_index + 1) % self.ring_size
+            entries = [
+                (self._seqs[i], self._timestamps[i], self._slots[i])
+                for i in range(self.ring_size)
+                if self._seqs[i] and i != writing and start <= self._timestamps[i] <= end
+            ]
+        return sorted(entries, key=lambda entry: entry[0])
+
+    def copy_frame(self, seq: int) -> Optional[np.ndarray]:
+        """시퀀스 번호 ``seq`` 프레임이 아직 링에 있으면 복사본을 반환합니다 (없으면 None)."""
+        with self._lock:
+            indices = [i for i in range(self.ring_size) if self._seqs[i] == seq]
+        if not indices:
+            return None
+        index = indices[0]
+        frame = self._slots[index].copy()
+        with self._lock:
+            if self._seqs[index] == seq and (self._latest_index + 1) % self.ring_size != index:
+                return frame
+        return None
+
+    @property
+    def latest_time(self) -> float:
+        """최신 프레임의 도착 시각 (``time.monotonic()``, 프레임이 없으면 0)."""
+        with self._lock:
+            return self._timestamps[self._latest_index] if self._latest_index >= 0 else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """링 버퍼가 차지하는 바이트 수."""
+        return sum(slot.nbytes for slot in self._slots if slot is not None)
+
+    @property
+    def signal_lost(self) -> bool:
+        return self._consecutive_failures >= self.SIGNAL_LOST_FAILURES
+
+    def stop(self, timeout: float = 1.0):
+        """스레드를 종료하고 카메라를 해제합니다."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+        else:
+            # 시작되지 않은 스레드는 run()의 해제 경로를 타지 않음
+            self.capture.release()
@@ -0,0 +1,71 @@
+"""Monotonic capture schedule.
+
+촬영 시작 시점에 모든 촬영 시각(마감 시각)을 ``time.monotonic()`` 기준으로 미리 계산합니다.
+1초짜리 타이머 틱을 세는 방식은 GUI 스레드가 잠시 멈출 때마다 이후 촬영이 모두 밀리지만,
+미리 정한 마감 시각은 밀리지 않으므로 카운트다운 표시는 일정을 보여 주기만 하고 실제
+사진은 카메라 링 버퍼에서 마감 시각에 가장 가까운 프레임을 골라 사용합니다.
+"""
+import math
+import time
+from typing import List, Optional
+
+
+class CaptureSchedule:
+    """촬영 마감 시각 목록과 진행 상태.
+
+    Attributes:
+        deadlines: 촬영 마감 시각 목록 (``time.monotonic()``)
+        shot_times: 실제로 사용한 프레임의 도착 시각 (촬영한 순서대로)
+    """
+
+    def __init__(self, count: int, countdown_s: float, interval_s: float, start: Optional[float] = None):
+        """
+        Args:
+            count: 촬영 장수
+            countdown_s: 시작부터 첫 촬영까지의 시간 (초)
+            interval_s: 촬영 간격 (초)
+            start: 기준 시각 (기본: 현재 ``time.monotonic()``)
+        """
+        if count < 1:
+            raise ValueError("촬영 장수는 1 이상이어야 합니다.")
+        start = time.monotonic() if start is None else start
+        self.deadlines: List[float] = [start + countdown_s + i * interval_s for i in range(count)]
+        self.shot_times: List[float] = []
+
+    @property
+    def taken(self) -> int:
+        return len(self.shot_times)
+
+    @property
+    def finished(self) -> bool:
+        return self.taken >= len(self.deadlines)
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        return None if self.finished else self.deadlines[self.taken]
+
+    def due(self, now: Optional[float] = None) -> bool:
+        """다음 촬영 마감 시각이 지났는지 확인합니다."""
+        deadline = self.next_deadline
+        return deadline is not None and (time.monotonic() if now is None else now) >= deadline
+
+    def seconds_left(self, now: Optional[float] = None) -> int:
+        """다음 촬영까지 남은 시간 (카운트다운 표시용, 올림한 초)."""
+        deadline = self.next_deadline
+        if deadline is None:
+            return 0
+        remaining = deadline - (time.monotonic() if now is None else now)
+        return max(0, math.ceil(remaining - 1e-6))
+
+    def record_shot(self, frame_time: float) -> float:
+        """다음 촬영에 사용한 프레임을 기록합니다.
+
+        Args:
+            frame_time: 사용한 프레임의 도착 시각
+
+        Returns:
+            마감 시각 대비 오차 (ms, 양수면 마감 시각 이후 프레임)
+        """
+        drift_ms = (frame_time - self.deadlines[self.taken]) * 1000
+        self.shot_times.append(frame_time)
+        return drift_ms
@@ -0,0 +1,92 @@
+"""Per-session memory ownership.
+
+한 번의 촬영 세션 동안 생기는 메모리 버퍼(캡처 프레임, 썸네일 피라미드, QPixmap,
+갤러리 레이블, 합성 결과)를 한 객체가 소유하고 ``close()`` 에서 한 번에 해제합니다.
+키오스크는 하루 12시간 이상 세션을 반복하므로, 이전 세션의 버퍼가 위젯/딕셔너리 참조로
+남아 메모리가 조금씩 늘어나는 일이 없도록 세션 종료 시점을 명확히 합니다.
+"""
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from PyQt5.QtWidgets import QLabel
+
+from capture_ranker import CaptureRanker
+from frame_store import FrameStore
+from image_io import read_image
+from session_store import SessionLog
+
+MEMORY_CATEGORIES = ("frames", "thumbnails", "pixmaps", "gallery", "composite")
+
+
+def pixmap_nbytes(label: QLabel) -> int:
+    pixmap = label.pixmap()
+    if pixmap is None or pixmap.isNull():
+        return 0
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+class CaptureSession:
+    """촬영 세션 하나가 소유하는 버퍼 모음.
+
+    Attributes:
+        log: 세션 디렉터리와 매니페스트
+        frames: 캡처 프레임/썸네일/QPixmap 저장소
+        ranker: 캡처 점수 (자동 선택용)
+        gallery: 갤러리 썸네일 레이블 (세션 종료 시 픽스맵을 비우고 삭제)
+        result: 열려 있는 최종 결과 다이얼로그 (합성 결과 보유)
+    """
+
+    def __init__(self, log: Optional[SessionLog] = None, loader: Callable[[Path], Optional[np.ndarray]] = read_image):
+        self.log = log
+        self.frames = FrameStore(loader=loader)
+        self.ranker = CaptureRanker()
+        self.gallery: List[QLabel] = []
+        self.result = None
+        self.closed = False
+
+    def adopt_label(self, label: QLabel):
+        """세션 종료 시 함께 해제할 갤러리 레이블을 등록합니다."""
+        self.gallery.append(label)
+
+    def adopt_result(self, dialog):
+        """최종 결과 다이얼로그를 등록합니다 (이전 다이얼로그는 해제)."""
+        self.release_result()
+        self.result = dialog
+
+    def release_result(self):
+        if self.result is not None:
+            self.result.release()
+            self.result = None
+
+    def memory_usage(self) -> Dict[str, int]:
+        """분류별로 이 세션이 보유한 바이트 수.
+
+        ``gallery`` 는 레이블에 설정된 QPixmap 크기입니다. 저장소 캐시의 QPixmap과 데이터를
+        공유할 수 있으므로 ``pixmaps`` 와 겹쳐 셀 수 있습니다.
+        """
+        usage = dict.fromkeys(MEMORY_CATEGORIES, 0)
+        usage.update(self.frames.memory_usage())
+        usage["gallery"] = sum(pixmap_nbytes(label) for label in self.gallery)
+        if self.result is not None:
+            usage["composite"] = self.result.nbytes
+        return usage
+
+    def close(self):
+        """세션 버퍼를 모두 해제하고 매니페스트를 닫습니다 (여러 번 호출해도 안전).
+
+        레이블은 ``deleteLater`` 로 삭제되므로 이벤트 루프가 한 번 돌아야 실제로 사라지지만,
+        픽스맵은 여기서 바로 비웁니다.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.release_result()
+        for label in self.gallery:
+            label.clear()
+            label.deleteLater()
+        self.gallery.clear()
+        self.frames.clear()
+        self.ranker.clear()
+        if self.log is not None:
+            self.log.close()
@@ -0,0 +1,100 @@
+"""Background capture persistence.
+
+캡처 프레임의 인코딩/저장을 GUI 스레드 밖의 스레드 풀에서 수행합니다.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from image_io import EncodeSettings, write_image
+
+
+class CaptureWriter(QObject):
+    """프레임을 백그라운드에서 저장하고 완료 시 ``saved`` 시그널을 보내는 작성기.
+
+    동시에 대기할 수 있는 작업 수는 ``max_pending`` 으로 제한되며, 가득 차면
+    ``submit()`` 이 자리가 날 때까지 기다립니다 (메모리 사용량 상한).
+    """
+
+    saved = pyqtSignal(str, bool)  # (파일 경로, 성공 여부)
+
+    MAX_WORKERS = 2
+    MAX_PENDING = 8
+
+    def __init__(
+        self,
+        encoding: Optional[EncodeSettings] = None,
+        max_workers: int = MAX_WORKERS,
+        max_pending: int = MAX_PENDING,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.encoding = encoding or EncodeSettings()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="CaptureWriter")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending: Dict[Path, Future] = {}
+        self._failed: Set[Path] = set()
+
+    def submit(self, frame: np.ndarray, path: Path) -> Future:
+        """프레임 저장 작업을 등록합니다. 호출자는 이후 ``frame`` 을 수정하면 안 됩니다."""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._write, frame, path)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending[path] = future
+            self._failed.discard(path)
+        future.add_done_callback(lambda f, p=path: self._on_done(p, f))
+        return future
+
+    def _write(self, frame: np.ndarray, path: Path) -> bool:
+        return write_image(path, frame, self.encoding)
+
+    def _on_done(self, path: Path, future: Future):
+        self._slots.release()
+        try:
+            success = future.result()
+        except Exception as e:
+            print(f"Capture write error ({path}): {e}")
+            success = False
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+                if not success:
+                    self._failed.add(path)
+        # 작업 스레드에서 emit해도 수신 객체가 GUI 스레드에 있으면 큐 연결로 전달됨
+        self.saved.emit(str(path), success)
+
+    def flush(self, paths: Optional[Iterable[Path]] = None, timeout: Optional[float] = None) -> bool:
+        """대기 중인 저장 작업이 끝날 때까지 기다립니다.
+
+        Args:
+            paths: 기다릴 파일 경로들. None이면 모든 작업
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            지정한 작업이 모두 성공적으로 저장되었으면 True
+        """
+        with self._lock:
+            if paths is None:
+                futures = list(self._pending.values())
+                already_failed = bool(self._failed)
+            else:
+                paths = list(paths)
+                futures = [self._pending[p] for p in paths if p in self._pending]
+                already_failed = any(p in self._failed for p in paths)
+        done, not_done = wait(futures, timeout=timeout)
+        if not_done or already_failed:
+            return False
+        return all(f.exception() is None and f.result() for f in done)
+
+    def shutdown(self, wait_for_pending: bool = True):
+        """남은 작업을 (기본적으로) 모두 저장한 뒤 스레드 풀을 종료합니다."""
+        self._executor.shutdown(wait=wait_for_pending)
@@ -0,0 +1,182 @@
+"""Strip compositor.
+
+최종 캔버스 크기를 먼저 계산해 한 번만 할당하고, 각 사진을 캔버스의 해당 영역에
+``cv2.resize(dst=...)`` 로 직접 기록합니다 (중간 배열과 vstack/hstack 복사 없음).
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+Rect = Tuple[int, int, int, int]  # (x, y, width, height)
+
+
+@dataclass(frozen=True)
+class StripLayout:
+    """스트립 배치 설정.
+
+    Attributes:
+        orientation: "vertical" 또는 "horizontal"
+        padding: 캔버스 바깥 여백 (px)
+        gutter: 사진 사이 간격 (px)
+        background: 여백/간격 배경색 (BGR)
+        interpolation: 리사이즈 보간법 (최종 인쇄용은 LANCZOS4, 미리보기는 AREA/LINEAR)
+    """
+
+    orientation: str = "vertical"
+    padding: int = 0
+    gutter: int = 0
+    background: Tuple[int, int, int] = (255, 255, 255)
+    interpolation: int = cv2.INTER_LANCZOS4
+
+    def __post_init__(self):
+        if self.orientation not in ("vertical", "horizontal"):
+            raise ValueError("layout은 'vertical' 또는 'horizontal'이어야 합니다.")
+
+
+def strip_geometry(sizes: Sequence[Tuple[int, int]], layout: StripLayout) -> Tuple[Tuple[int, int], List[Rect]]:
+    """사진 크기 목록으로 캔버스 크기와 각 사진 영역을 계산합니다.
+
+    세로 배치는 가장 넓은 사진의 너비에, 가로 배치는 가장 높은 사진의 높이에 맞춥니다.
+
+    Args:
+        sizes: 사진 크기 목록 [(너비, 높이), ...]
+        layout: 배치 설정
+
+    Returns:
+        ((캔버스 너비, 캔버스 높이), [사진 영역, ...])
+    """
+    pad, gutter = layout.padding, layout.gutter
+    rects: List[Rect] = []
+    if layout.orientation == "vertical":
+        width = max(w for w, _ in sizes)
+        y = pad
+        for w, h in sizes:
+            height = int(h * (width / w))
+            rects.append((pad, y, width, height))
+            y += height + gutter
+        canvas = (width + 2 * pad, y - gutter + pad)
+    else:
+        height = max(h for _, h in sizes)
+        x = pad
+        for w, h in sizes:
+            width = int(w * (height / h))
+            rects.append((x, pad, width, height))
+            x += width + gutter
+        canvas = (x - gutter + pad, height + 2 * pad)
+    return canvas, rects
+
+
+def fill_background(canvas: np.ndarray, rects: Sequence[Rect], color: Tuple[int, int, int]):
+    """사진 영역을 제외한 여백/간격 띠만 배경색으로 채웁니다.
+
+    ``strip_geometry`` 의 사진 영역은 한 줄로 나란히 놓이므로, 바깥 여백 네 변과
+    사진 사이 간격(사진보다 짧은 축의 남는 부분 포함)만 채우면 됩니다.
+    """
+    height, width = canvas.shape[:2]
+    xs = [x for x, _, _, _ in rects]
+    vertical = len(set(xs)) == 1
+    x0 = min(xs)
+    y0 = min(y for _, y, _, _ in rects)
+    x1 = max(x + w for x, _, w, _ in rects)
+    y1 = max(y + h for _, y, _, h in rects)
+    canvas[:y0] = color
+    canvas[y1:] = color
+    canvas[y0:y1, :x0] = color
+    canvas[y0:y1, x1:] = color
+    cursor = y0 if vertical else x0
+    for x, y, w, h in rects:
+        if vertical:
+            canvas[cursor:y, x0:x1] = color
+            canvas[y:y + h, x + w:x1] = color
+            cursor = y + h
+        else:
+            canvas[y0:y1, cursor:x] = color
+            canvas[y + h:y1, x:x + w] = color
+            cursor = x + w
+
+
+def compose_strip(images: Sequence[np.ndarray], layout: StripLayout = StripLayout(), out: Optional[np.ndarray] = None) -> np.ndarray:
+    """사진들을 하나의 스트립 이미지로 합성합니다.
+
+    Args:
+        images: BGR 사진 배열 목록
+        layout: 배치 설정
+        out: 결과를 기록할 배열 (크기가 맞으면 재사용)
+
+    Returns:
+        합성된 BGR 이미지
+    """
+    (canvas_w, canvas_h), rects = strip_geometry([(img.shape[1], img.shape[0]) for img in images], layout)
+    if out is None or out.shape != (canvas_h, canvas_w, 3):
+        out = np.empty((canvas_h, canvas_w, 3), dtype=np.uint8)
+
+    fill_background(out, rects, layout.background)
+    for img, (x, y, w, h) in zip(images, rects):
+        view = out[y:y + h, x:x + w]
+        # 복사/리사이즈 모두 같은 채널 처리 (BGRA는 알파를 버림 - 3채널 dst에 4채널을 넘기면
+        # OpenCV가 새 배열을 만들어 캔버스에는 기록되지 않음)
+        src = img[:, :, :3]
+        if img.shape[:2] == (h, w):
+            np.copyto(view, src)
+        else:
+            cv2.resize(src, (w, h), dst=view, interpolation=layout.interpolation)
+    return out
+
+
+def cover_crop(image: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """``size`` 의 비율에 맞게 이미지 가운데를 잘라낸 뷰를 반환합니다 (복사 없음)."""
+    src_h, src_w = image.shape[:2]
+    dst_w, dst_h = size
+    if src_w * dst_h > dst_w * src_h:
+        crop_w = max(1, round(src_h * dst_w / dst_h))
+        x = (src_w - crop_w) // 2
+        return image[:, x:x + crop_w]
+    crop_h = max(1, round(src_w * dst_h / dst_w))
+    if crop_h < src_h:
+        y = (src_h - crop_h) // 2
+        return image[y:y + crop_h]
+    return image
+
+
+def compose_slots(
+    images: Sequence[np.ndarray],
+    canvas_size: Tuple[int, int],
+    rects: Sequence[Rect],
+    background: Tuple[int, int, int] = (255, 255, 255),
+    interpolation: int = cv2.INTER_LANCZOS4,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """고정된 사진 영역(슬롯)에 사진들을 채워 합성합니다.
+
+    사진은 슬롯 비율에 맞게 가운데를 잘라(cover) 슬롯 뷰에 바로 리사이즈합니다.
+
+    Args:
+        images: BGR 사진 배열 목록 (슬롯 순서대로)
+        canvas_size: 캔버스 크기 (너비, 높이)
+        rects: 사진 영역 목록
+        background: 슬롯 밖 배경색 (BGR)
+        interpolation: 리사이즈 보간법
+        out: 결과를 기록할 배열 (크기가 맞으면 재사용)
+
+    Returns:
+        합성된 BGR 이미지
+    """
+    if len(images) != len(rects):
+        raise ValueError(f"사진 {len(rects)}장이 필요합니다 (받은 사진: {len(images)}장).")
+    canvas_w, canvas_h = canvas_size
+    if out is None or out.shape != (canvas_h, canvas_w, 3):
+        out = np.empty((canvas_h, canvas_w, 3), dtype=np.uint8)
+
+    # 슬롯이 캔버스를 빈틈없이 덮지 않을 때만 배경을 채움
+    if sum(w * h for _, _, w, h in rects) < canvas_w * canvas_h:
+        out[:] = background
+    for img, (x, y, w, h) in zip(images, rects):
+        view = out[y:y + h, x:x + w]
+        src = cover_crop(img[:, :, :3], (w, h))
+        if src.shape[:2] == (h, w):
+            np.copyto(view, src)
+        else:
+            cv2.resize(src, (w, h), dst=view, interpolation=interpolation)
+    return out
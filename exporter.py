@@ -0,0 +1,213 @@
+"""Result export.
+
+결과 파일을 사용자가 고른 위치로 내보냅니다. 같은 파일 시스템이면 하드 링크,
+reflink(copy-on-write) 순으로 데이터 복사 없이 처리하고, 그 외에는 커널 안에서
+``copy_file_range``/``sendfile`` 로 청크 단위 복사합니다. 다른 형식으로 저장할 때는
+메모리의 합성 결과를 바로 인코딩하므로 PNG를 다시 읽지 않습니다.
+"""
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from image_io import EncodeSettings, read_image, write_image
+from metrics import default_metrics
+
+EXPORT_FORMATS = ("png", "jpeg", "webp")  # 사용자에게 제공하는 내보내기 형식 (raw .npy 제외)
+CHUNK_SIZE = 8 * 1024 * 1024  # USB 메모리 등 느린 장치에서도 진행이 끊기지 않는 크기
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+
+def _try_hardlink(src: Path, dst: Path) -> bool:
+    if src.stat().st_dev != dst.parent.stat().st_dev:
+        return False
+    try:
+        os.link(src, dst)
+    except OSError:
+        # FAT/exFAT 등 하드 링크를 지원하지 않는 파일 시스템
+        return False
+    return True
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except OSError:
+        # 다른 파일 시스템이거나 reflink 미지원 (Btrfs/XFS/APFS 등만 지원)
+        return False
+    return True
+
+
+def _copy_range(src_fd: int, dst_fd: int, size: int) -> str:
+    """커널 안에서 청크 단위로 복사하고 사용한 방법 이름을 반환합니다."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            offset = 0
+            while offset < size:
+                copied = os.copy_file_range(src_fd, dst_fd, min(CHUNK_SIZE, size - offset))
+                if copied == 0:
+                    break
+                offset += copied
+            if offset == size:
+                return "copy_file_range"
+        except OSError:
+            pass
+        # 일부만 복사된 경우 처음부터 다시
+        os.lseek(src_fd, 0, os.SEEK_SET)
+        os.ftruncate(dst_fd, 0)
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        try:
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, min(CHUNK_SIZE, size - offset))
+                if sent == 0:
+                    break
+                offset += sent
+            if offset == size:
+                return "sendfile"
+        except OSError:
+            pass
+        os.ftruncate(dst_fd, 0)
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    while True:
+        chunk = os.read(src_fd, CHUNK_SIZE)
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        while view:
+            written = os.write(dst_fd, view)
+            view = view[written:]
+    return "copy"
+
+
+def export_file(src: Path, dst: Path, allow_link: bool = True) -> str:
+    """결과 파일을 ``dst`` 로 내보냅니다.
+
+    하드 링크 → reflink → ``copy_file_range``/``sendfile`` → 일반 복사 순으로 시도합니다.
+    복사한 경우 파일 내용을 디스크에 확정(fsync)한 뒤 반환하므로 바로 USB를 뽑아도 됩니다.
+
+    Args:
+        src: 원본 파일
+        dst: 대상 경로 (이미 있으면 교체)
+        allow_link: 하드 링크 허용 여부 (대상이 원본과 inode를 공유해도 되는 경우)
+
+    Returns:
+        사용한 방법 ("hardlink", "reflink", "copy_file_range", "sendfile", "copy")
+    """
+    src, dst = Path(src), Path(dst)
+    if src.resolve() == dst.resolve():
+        return "same"
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    # 같은 디렉터리의 임시 이름으로 만든 뒤 교체하므로 중간에 실패해도 반쯤 쓴 파일이 남지 않음
+    tmp = dst.with_name(f".{dst.name}.part")
+    if tmp.exists():
+        tmp.unlink()
+
+    try:
+        if allow_link and _try_hardlink(src, tmp):
+            method = "hardlink"
+        else:
+            with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+                src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+                if _try_reflink(src_fd, dst_fd):
+                    method = "reflink"
+                else:
+                    method = _copy_range(src_fd, dst_fd, os.fstat(src_fd).st_size)
+                os.fsync(dst_fd)
+            shutil.copystat(src, tmp)
+        os.replace(tmp, dst)
+        if tmp.exists():
+            # dst가 이미 같은 inode의 링크였으면 rename은 아무 일도 하지 않음
+            tmp.unlink()
+    except BaseException:
+        if tmp.exists():
+            tmp.unlink()
+        raise
+    return method
+
+
+def export_image(image: np.ndarray, dst: Path, encoding: Optional[EncodeSettings] = None) -> bool:
+    """메모리의 합성 결과를 ``dst`` 형식으로 바로 인코딩해 저장합니다."""
+    return write_image(Path(dst), image, encoding, durable=True)
+
+
+class Exporter(QObject):
+    """내보내기를 백그라운드 스레드에서 수행하고 ``finished`` 시그널로 결과를 알립니다.
+
+    Args:
+        allow_link: 같은 파일 시스템이면 하드 링크 허용. 결과 파일은 제자리에서 수정되지
+            않고 항상 새 파일로 교체(``os.replace``)되므로 세션 결과와 inode를 공유해도 안전
+    """
+
+    finished = pyqtSignal(str, bool, str)  # (대상 경로, 성공 여부, 사용한 방법 또는 오류 메시지)
+
+    def __init__(self, allow_link: bool = True, parent=None):
+        super().__init__(parent)
+        self.allow_link = allow_link
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def export(
+        self,
+        dst: Path,
+        src: Optional[Path] = None,
+        image: Optional[np.ndarray] = None,
+        encoding: Optional[EncodeSettings] = None,
+    ):
+        """내보내기를 시작합니다.
+
+        ``encoding`` 이 없고 ``dst`` 형식이 ``src`` 와 같으면 파일을 그대로 내보내고,
+        그 외에는 ``image`` 를 인코딩합니다 (``image`` 가 없으면 파일을 읽어 변환).
+
+        Args:
+            dst: 대상 경로
+            src: 이미 저장된 결과 파일
+            image: 메모리에 있는 합성 결과 (BGR)
+            encoding: 인코딩 설정 (형식/품질을 바꿔 저장할 때 지정)
+        """
+        self._thread = threading.Thread(
+            target=self._run, args=(Path(dst), src, image, encoding), name="Exporter", daemon=True
+        )
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self, dst: Path, src: Optional[Path], image: Optional[np.ndarray], encoding: Optional[EncodeSettings]):
+        try:
+            same_format = src is not None and EncodeSettings.for_path(src).format == EncodeSettings.for_path(dst).format
+            if same_format and encoding is None:
+                with default_metrics().timer("export.file"):
+                    method = export_file(src, dst, allow_link=self.allow_link)
+                default_metrics().count(f"export.{method}")
+                self.finished.emit(str(dst), True, method)
+                return
+            if image is None and src is not None:
+                image = read_image(src)
+            if image is None:
+                raise ValueError("내보낼 이미지가 없습니다.")
+            success = export_image(image, dst, encoding)
+            default_metrics().count("export.encode")
+            self.finished.emit(str(dst), success, "encode")
+        except Exception as e:
+            print(f"파일 저장 오류: {e}")
+            self.finished.emit(str(dst), False, str(e))
@@ -0,0 +1,228 @@
+"""Decorative frame registry.
+
+``assets/frames`` 의 장식 프레임을 한 번만 디코딩해 미리 곱한 알파(premultiplied)
+RGBA로 보관하고, 출력 크기별로 준비된 오버레이를 메모리 한도가 있는 LRU 캐시로 재사용합니다.
+디렉터리를 주기적으로 확인하므로 재시작 없이 프레임을 추가/교체할 수 있습니다.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from blending import PreparedOverlay, premultiply
+
+DEFAULT_FRAMES_DIR = Path(__file__).resolve().parent / "assets" / "frames"
+FRAME_EXTENSIONS = (".png", ".webp", ".jpg", ".jpeg")
+
+Rect = Tuple[int, int, int, int]  # (x, y, width, height)
+
+
+@dataclass
+class FrameAsset:
+    """디코딩된 장식 프레임과 메타데이터.
+
+    Attributes:
+        name: 프레임 이름 (파일 이름에서 확장자를 뺀 것)
+        path: 프레임 파일 경로
+        mtime_ns: 디코딩 시점의 파일 수정 시각
+        overlay: 미리 곱한 알파 BGRA (알파가 없는 프레임은 BGR)
+        slots: 사진이 들어갈 영역 (원본 픽셀 좌표, 위→아래, 왼쪽→오른쪽 순)
+    """
+
+    name: str
+    path: Path
+    mtime_ns: int
+    overlay: np.ndarray = field(repr=False)
+    slots: List[Rect] = field(default_factory=list)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.overlay.shape[1], self.overlay.shape[0]
+
+    @property
+    def aspect_ratio(self) -> float:
+        width, height = self.size
+        return width / height
+
+    @property
+    def has_alpha(self) -> bool:
+        return self.overlay.shape[2] == 4
+
+    def slots_for(self, size: Tuple[int, int]) -> List[Rect]:
+        """출력 크기에 맞춰 사진 영역 좌표를 변환합니다."""
+        sx = size[0] / self.size[0]
+        sy = size[1] / self.size[1]
+        return [
+            (round(x * sx), round(y * sy), round(w * sx), round(h * sy))
+            for x, y, w, h in self.slots
+        ]
+
+
+def detect_slots(alpha: np.ndarray, min_area_ratio: float = 0.01) -> List[Rect]:
+    """프레임 알파에서 투명한 사진 영역(구멍)을 찾아 사각형 목록으로 반환합니다."""
+    transparent = (alpha < 128).astype(np.uint8)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(transparent, connectivity=4)
+    min_area = alpha.size * min_area_ratio
+    rects = [
+        (int(x), int(y), int(w), int(h))
+        for x, y, w, h, area in stats[1:]
+        if area >= min_area
+    ]
+    return sorted(rects, key=lambda r: (r[1], r[0]))
+
+
+def _load_asset(path: Path, mtime_ns: int) -> Optional[FrameAsset]:
+    image = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+    if image is None:
+        return None
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+    slots: List[Rect] = []
+    sidecar = path.with_suffix(".json")
+    if sidecar.exists():
+        # 사진 영역을 직접 지정한 메타데이터 파일 ({"slots": [[x, y, w, h], ...]})
+        try:
+            slots = [tuple(int(v) for v in rect) for rect in json.loads(sidecar.read_text(encoding="utf-8"))["slots"]]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"프레임 메타데이터 오류 ({sidecar}): {e}")
+
+    if image.shape[2] == 4:
+        if not slots:
+            slots = detect_slots(image[:, :, 3])
+        image = premultiply(image)
+    return FrameAsset(path.stem, path, mtime_ns, image, slots)
+
+
+class FrameRegistry:
+    """장식 프레임 레지스트리.
+
+    Args:
+        directory: 프레임 디렉터리
+        budget_bytes: 출력 크기별 준비된 오버레이를 보관할 최대 바이트 수 (LRU).
+            스트립 해상도 오버레이 하나가 수십 MB이므로 개수가 아니라 크기로 제한
+        refresh_interval: 디렉터리 변경을 확인하는 최소 간격 (초)
+    """
+
+    DEFAULT_BUDGET_BYTES = 128 * 1024 * 1024
+    REFRESH_INTERVAL_S = 2.0
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_FRAMES_DIR,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        refresh_interval: float = REFRESH_INTERVAL_S,
+    ):
+        self.directory = Path(directory)
+        self.budget_bytes = budget_bytes
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._files: Dict[str, Tuple[Path, int]] = {}  # 이름 -> (경로, 수정 시각)
+        self._assets: Dict[Path, FrameAsset] = {}  # 디코딩된 프레임 (경로 기준)
+        self._prepared: "OrderedDict[Tuple[Path, int, Tuple[int, int]], PreparedOverlay]" = OrderedDict()
+        self._prepared_bytes = 0
+        self._last_scan = None
+
+    # ---- Directory scanning -------------------------------------------------------
+
+    def refresh(self, force: bool = False) -> bool:
+        """디렉터리를 다시 확인합니다 (``refresh_interval`` 이내의 반복 호출은 무시).
+
+        Returns:
+            프레임 목록이나 파일이 바뀌었으면 True
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._last_scan is not None and now - self._last_scan < self.refresh_interval:
+                return False
+            self._last_scan = now
+
+            files: Dict[str, Tuple[Path, int]] = {}
+            if self.directory.is_dir():
+                with os.scandir(self.directory) as entries:
+                    for entry in entries:
+                        path = Path(entry.path)
+                        if entry.is_file() and path.suffix.lower() in FRAME_EXTENSIONS:
+                            files[path.stem] = (path, entry.stat().st_mtime_ns)
+            if files == self._files:
+                return False
+
+            # 바뀌거나 삭제된 프레임의 디코딩 결과와 준비된 오버레이 제거
+            current = set(files.values())
+            for path in [p for p in self._assets if (p, self._assets[p].mtime_ns) not in current]:
+                if path.parent == self.directory:
+                    del self._assets[path]
+            for key in [k for k in self._prepared if k[0].parent == self.directory and k[:2] not in current]:
+                self._prepared_bytes -= self._prepared.pop(key).nbytes
+            self._files = files
+            return True
+
+    def names(self) -> List[str]:
+        self.refresh()
+        with self._lock:
+            return sorted(self._files)
+
+    # ---- Lookup ------------------------------------------------------------------
+
+    def get(self, frame: Union[str, Path]) -> Optional[FrameAsset]:
+        """프레임 이름 또는 파일 경로로 디코딩된 프레임을 가져옵니다 (최초 1회만 디코딩)."""
+        self.refresh()
+        with self._lock:
+            if isinstance(frame, str) and frame in self._files:
+                path, mtime_ns = self._files[frame]
+            else:
+                path = Path(frame)
+                try:
+                    mtime_ns = path.stat().st_mtime_ns
+                except OSError:
+                    return None
+
+            asset = self._assets.get(path)
+            if asset is None or asset.mtime_ns != mtime_ns:
+                asset = _load_asset(path, mtime_ns)
+                if asset is None:
+                    return None
+                self._assets[path] = asset
+            return asset
+
+    def overlay(self, frame: Union[str, Path], size: Tuple[int, int]) -> Optional[PreparedOverlay]:
+        """출력 크기에 맞춰 준비된 오버레이를 반환합니다 (LRU 캐시)."""
+        asset = self.get(frame)
+        if asset is None:
+            return None
+        key = (asset.path, asset.mtime_ns, tuple(size))
+        with self._lock:
+            prepared = self._prepared.get(key)
+            if prepared is not None:
+                self._prepared.move_to_end(key)
+                return prepared
+        prepared = PreparedOverlay(asset.overlay, tuple(size), premultiplied=asset.has_alpha)
+        with self._lock:
+            previous = self._prepared.pop(key, None)
+            if previous is not None:
+                self._prepared_bytes -= previous.nbytes
+            self._prepared[key] = prepared
+            self._prepared_bytes += prepared.nbytes
+            # 오래된 파일 버전의 항목도 결국 LRU로 밀려남 (방금 만든 항목은 한도를 넘어도 유지)
+            while self._prepared_bytes > self.budget_bytes and len(self._prepared) > 1:
+                _, evicted = self._prepared.popitem(last=False)
+                self._prepared_bytes -= evicted.nbytes
+        return prepared
+
+
+_default_registry: Optional[FrameRegistry] = None
+
+
+def default_registry() -> FrameRegistry:
+    """``assets/frames`` 를 사용하는 공용 레지스트리를 반환합니다."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = FrameRegistry()
+    return _default_registry
@@ -0,0 +1,247 @@
+"""Frame sources.
+
+웹캠, 동영상 파일, 이미지 디렉터리, 생성 패턴을 같은 인터페이스로 제공합니다.
+카메라가 없는 환경(빌드 서버 등)에서도 캡처/미리보기/합성 파이프라인을 돌릴 수 있습니다.
+"""
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+DEFAULT_SOURCE = "webcam"
+SOURCE_ENV_VAR = "PHOTOBOOTH_SOURCE"
+
+
+class FrameSource(ABC):
+    """프레임 소스 인터페이스.
+
+    ``cv2.VideoCapture`` 와 같은 ``read()``/``isOpened()``/``release()`` 규약을 따르므로
+    ``CaptureThread`` 가 웹캠과 구분 없이 사용할 수 있습니다.
+    """
+
+    name = "source"
+
+    def __init__(self, fps: float = 0.0):
+        self.fps = fps  # 0이면 속도 제한 없이 최대한 빠르게 생성
+        self._next_frame_time = 0.0
+
+    @abstractmethod
+    def isOpened(self) -> bool:
+        ...
+
+    @abstractmethod
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """다음 프레임을 읽습니다. ``image`` 가 같은 크기이면 그 버퍼에 기록합니다."""
+
+    def release(self):
+        pass
+
+    def frame_rate(self) -> float:
+        """소스의 공칭 초당 프레임 수 (알 수 없거나 속도 제한이 없으면 0)."""
+        return self.fps
+
+    def _pace(self):
+        """실제 카메라처럼 ``fps`` 간격으로 프레임을 내보내도록 대기합니다."""
+        if self.fps <= 0:
+            return
+        now = time.monotonic()
+        if self._next_frame_time > now:
+            time.sleep(self._next_frame_time - now)
+        else:
+            # 뒤처진 경우 밀린 프레임을 몰아서 내보내지 않음
+            self._next_frame_time = now
+        self._next_frame_time += 1.0 / self.fps
+
+
+def _copy_into(frame: np.ndarray, image: Optional[np.ndarray]) -> np.ndarray:
+    if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+        np.copyto(image, frame)
+        return image
+    return frame.copy()
+
+
+class WebcamSource(FrameSource):
+    """플랫폼에 맞는 백엔드로 연 웹캠."""
+
+    name = "webcam"
+
+    def __init__(self, index: int = 0, backend: Optional[int] = None):
+        super().__init__()
+        if backend is None:
+            backend = self.default_backend()
+        self.capture = cv2.VideoCapture(index, backend)
+        if not self.capture.isOpened():
+            raise RuntimeError("Cannot open default webcam")
+
+    @staticmethod
+    def default_backend() -> int:
+        if sys.platform == "darwin":
+            return cv2.CAP_AVFOUNDATION
+        if sys.platform.startswith("win"):
+            return cv2.CAP_DSHOW
+        return cv2.CAP_ANY
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def read(self, image=None):
+        return self.capture.read(image) if image is not None else self.capture.read()
+
+    def release(self):
+        self.capture.release()
+
+    def frame_rate(self) -> float:
+        # 카메라가 속도를 정하므로 fps(속도 제한)는 0이지만 드라이버가 알려 주는 값은 있음
+        return self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+
+
+class VideoFileSource(FrameSource):
+    """동영상 파일을 재생하는 소스 (기본적으로 반복 재생)."""
+
+    name = "video"
+
+    def __init__(self, path: Path, loop: bool = True, realtime: bool = True):
+        self.path = Path(path)
+        self.capture = cv2.VideoCapture(str(self.path))
+        if not self.capture.isOpened():
+            raise RuntimeError(f"Cannot open video file: {self.path}")
+        fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+        super().__init__(fps if realtime else 0.0)
+        self.loop = loop
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def read(self, image=None):
+        self._pace()
+        ok, frame = self.capture.read(image) if image is not None else self.capture.read()
+        if not ok and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.capture.read(image) if image is not None else self.capture.read()
+        return ok, frame
+
+    def release(self):
+        self.capture.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """디렉터리의 이미지들을 순서대로 재생하는 소스 (예: ``captures/*.png``)."""
+
+    name = "images"
+
+    def __init__(self, directory: Path, pattern: str = "*.png", fps: float = 30.0, loop: bool = True):
+        super().__init__(fps)
+        self.directory = Path(directory)
+        self.loop = loop
+        self.frames: List[np.ndarray] = []
+        for path in sorted(self.directory.glob(pattern)):
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                self.frames.append(frame)
+        if not self.frames:
+            raise RuntimeError(f"No images matching {pattern} in {self.directory}")
+        self._position = 0
+
+    def isOpened(self) -> bool:
+        return bool(self.frames)
+
+    def read(self, image=None):
+        if self._position >= len(self.frames):
+            if not self.loop:
+                return False, None
+            self._position = 0
+        self._pace()
+        frame = self.frames[self._position]
+        self._position += 1
+        return True, _copy_into(frame, image)
+
+    def release(self):
+        self.frames = []
+
+
+class PatternSource(FrameSource):
+    """움직이는 그라디언트와 프레임 번호를 그리는 합성 소스."""
+
+    name = "pattern"
+
+    def __init__(self, width: int = 1280, height: int = 720, fps: float = 30.0):
+        super().__init__(fps)
+        self.width = width
+        self.height = height
+        # 가로로 두 배 긴 그라디언트를 미리 만들어 두고 매 프레임 잘라서 사용
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, np.newaxis]
+        base = np.empty((height, width, 3), dtype=np.uint8)
+        base[:, :, 0] = x
+        base[:, :, 1] = y
+        base[:, :, 2] = 255 - (x + y) / 2
+        self._base = np.concatenate([base, base], axis=1)
+        self._count = 0
+        self._opened = True
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self, image=None):
+        if not self._opened:
+            return False, None
+        self._pace()
+        shift = (self._count * 8) % self.width
+        view = self._base[:, shift:shift + self.width]
+        frame = _copy_into(view, image)
+        cv2.putText(
+            frame, f"#{self._count}", (20, 60),
+            cv2.FONT_HERSHEY_SIMPLEX, 2.0, (255, 255, 255), 3, cv2.LINE_AA,
+        )
+        self._count += 1
+        return True, frame
+
+    def release(self):
+        self._opened = False
+
+
+def open_frame_source(spec: Optional[str] = None) -> FrameSource:
+    """설정 문자열로 프레임 소스를 엽니다.
+
+    지원 형식:
+        ``webcam`` / ``webcam:1``
+        ``video:<파일 경로>``
+        ``images:<디렉터리>`` / ``images:<디렉터리>/*.jpg``
+        ``pattern`` / ``pattern:1920x1080`` / ``pattern:1920x1080@60``
+
+    Args:
+        spec: 소스 설정. None이면 ``PHOTOBOOTH_SOURCE`` 환경 변수, 없으면 웹캠
+
+    Returns:
+        열린 프레임 소스
+    """
+    if spec is None:
+        spec = os.environ.get(SOURCE_ENV_VAR, DEFAULT_SOURCE)
+    kind, _, arg = spec.partition(":")
+    kind = kind.strip().lower()
+
+    if kind == "webcam":
+        return WebcamSource(int(arg) if arg else 0)
+
+    if kind == "video":
+        if not arg:
+            raise ValueError("video 소스에는 파일 경로가 필요합니다.")
+        return VideoFileSource(Path(arg))
+
+    if kind == "images":
+        path = Path(arg or "captures")
+        if any(ch in path.name for ch in "*?["):
+            return ImageDirectorySource(path.parent, pattern=path.name)
+        return ImageDirectorySource(path)
+
+    if kind == "pattern":
+        size, _, fps = arg.partition("@")
+        width, height = (int(v) for v in size.lower().split("x")) if size else (1280, 720)
+        return PatternSource(width, height, float(fps) if fps else 30.0)
+
+    raise ValueError(f"알 수 없는 프레임 소스: {spec}")
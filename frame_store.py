@@ -0,0 +1,146 @@
+"""Session frame store.
+
+세션 동안 캡처 프레임(ndarray)과 파생 QPixmap을 캡처 번호별로 메모리에 보관합니다.
+메모리 예산을 넘으면 오래 사용하지 않은 프레임부터 내리고, 필요할 때 디스크에서 다시 읽습니다.
+파생 QPixmap은 캡처 시 한 번 만든 썸네일 피라미드에서 만들어집니다.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from PyQt5.QtGui import QPixmap
+
+from image_io import read_image
+from metrics import default_metrics
+from preview import fit_size, ndarray_to_pixmap
+from thumbnails import ThumbnailPyramid
+
+MAX_PIXMAPS_PER_FRAME = 4  # 창 크기 조절 중 크기별 QPixmap이 무한히 쌓이지 않도록
+
+
+def _build_pyramid(frame: np.ndarray) -> ThumbnailPyramid:
+    with default_metrics().timer("thumbnail.pyramid"):
+        return ThumbnailPyramid(frame)
+
+
+class _Entry:
+    __slots__ = ("path", "frame", "pyramid", "pixmaps")
+
+    def __init__(self, path: Path, frame: Optional[np.ndarray]):
+        self.path = path
+        self.frame = frame
+        self.pyramid = _build_pyramid(frame) if frame is not None else None
+        self.pixmaps: "OrderedDict[Tuple[int, int], QPixmap]" = OrderedDict()
+
+
+class FrameStore:
+    """캡처 번호 -> 프레임/파생 QPixmap 저장소.
+
+    Args:
+        budget_bytes: 메모리에 유지할 프레임 배열의 최대 바이트 수
+        loader: 메모리에서 내려간 프레임을 다시 읽는 함수 (기본: ``read_image``)
+    """
+
+    DEFAULT_BUDGET_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES, loader: Callable[[Path], Optional[np.ndarray]] = read_image):
+        self.budget_bytes = budget_bytes
+        self.loader = loader
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()  # LRU 순서
+        self._frame_bytes = 0
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """메모리에 있는 프레임 배열의 바이트 수."""
+        return self._frame_bytes
+
+    def memory_usage(self) -> Dict[str, int]:
+        """분류별 보유 바이트 수 (프레임 배열, 썸네일 피라미드, 캐시된 QPixmap)."""
+        thumbnails = sum(entry.pyramid.nbytes for entry in self._entries.values() if entry.pyramid is not None)
+        pixmaps = sum(
+            pixmap.width() * pixmap.height() * pixmap.depth() // 8
+            for entry in self._entries.values()
+            for pixmap in entry.pixmaps.values()
+        )
+        return {"frames": self._frame_bytes, "thumbnails": thumbnails, "pixmaps": pixmaps}
+
+    def add(self, index: int, frame: np.ndarray, path: Path):
+        """캡처 프레임을 등록합니다. 호출자는 이후 ``frame`` 을 수정하면 안 됩니다."""
+        self.discard(index)
+        self._entries[index] = _Entry(path, frame)
+        self._frame_bytes += frame.nbytes
+        self._enforce_budget(keep=index)
+
+    def path(self, index: int) -> Path:
+        return self._entries[index].path
+
+    def get(self, index: int) -> Optional[np.ndarray]:
+        """프레임 배열을 반환합니다. 메모리에 없으면 디스크에서 다시 읽습니다."""
+        entry = self._entries[index]
+        self._entries.move_to_end(index)
+        if entry.frame is None:
+            frame = self.loader(entry.path)
+            if frame is None:
+                return None
+            entry.frame = frame
+            self._frame_bytes += frame.nbytes
+            self._enforce_budget(keep=index)
+        return entry.frame
+
+    def pixmap(self, index: int, width: int, height: int) -> Optional[QPixmap]:
+        """비율을 유지하며 ``width`` x ``height`` 에 맞춘 QPixmap을 반환합니다 (캐시됨).
+
+        목표 크기 이상인 가장 작은 피라미드 단계에서 최종 축소만 하므로 원본 해상도를
+        다시 읽지 않습니다. 원본보다 큰 단계가 필요할 때만 원본 프레임을 사용합니다.
+        """
+        entry = self._entries[index]
+        key = (width, height)
+        pixmap = entry.pixmaps.get(key)
+        if pixmap is not None:
+            entry.pixmaps.move_to_end(key)
+            return pixmap
+
+        source = entry.pyramid.level_for(width, height) if entry.pyramid is not None else None
+        if source is None:
+            source = self.get(index)
+            if source is None:
+                return None
+            if entry.pyramid is None:
+                entry.pyramid = _build_pyramid(source)
+        with default_metrics().timer("thumbnail.pixmap"):
+            h, w = source.shape[:2]
+            size = fit_size(w, h, width, height)
+            scaled = cv2.resize(source, size, interpolation=cv2.INTER_AREA) if size != (w, h) else source
+            pixmap = ndarray_to_pixmap(scaled)
+        entry.pixmaps[key] = pixmap
+        if len(entry.pixmaps) > MAX_PIXMAPS_PER_FRAME:
+            entry.pixmaps.popitem(last=False)
+        return pixmap
+
+    def discard(self, index: int):
+        entry = self._entries.pop(index, None)
+        if entry is not None and entry.frame is not None:
+            self._frame_bytes -= entry.frame.nbytes
+
+    def clear(self):
+        """모든 프레임, 피라미드, 파생 QPixmap을 해제합니다 (새 세션 시작 시)."""
+        self._entries.clear()
+        self._frame_bytes = 0
+
+    def _enforce_budget(self, keep: int):
+        # 가장 오래 사용하지 않은 프레임부터 메모리에서 내림 (경로와 파생 QPixmap은 유지)
+        for index, entry in self._entries.items():
+            if self._frame_bytes <= self.budget_bytes:
+                break
+            if index == keep or entry.frame is None:
+                continue
+            self._frame_bytes -= entry.frame.nbytes
+            entry.frame = None
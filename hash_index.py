@@ -0,0 +1,253 @@
+"""Perceptual-hash index over the capture archive.
+
+세션 저장소(``captures``)의 모든 캡처와 최종 결과 이미지의 지각 해시(pHash, dHash)를
+작은 추가 전용 파일에 보관하고, 인쇄된 결과나 사진 한 장으로 원본 세션을 찾습니다.
+
+    - ``hash_index.bin``: 이미지마다 16바이트 (pHash, dHash ``uint64``)
+    - ``hash_index.paths``: 같은 순서의 상대 경로 (한 줄에 하나)
+
+조회는 전체 해시 배열에 대한 벡터화된 해밍 거리 계산이므로 수십만 장도 수 ms에 끝납니다.
+앱은 캡처/결과 파일이 디스크에 확정될 때마다 ``add()`` 로 색인을 갱신합니다.
+
+사용 예::
+
+    python -m hash_index build captures
+    python -m hash_index query scan.jpg --root captures -k 5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from image_hash import dhash, hamming_distances, phash
+from image_io import format_for_path, read_image
+
+INDEX_NAME = "hash_index.bin"
+PATHS_NAME = "hash_index.paths"
+RECORD_DTYPE = np.dtype([("phash", "<u8"), ("dhash", "<u8")])
+
+
+@dataclass(frozen=True)
+class HashMatch:
+    """조회 결과 한 건.
+
+    Attributes:
+        path: 이미지 경로
+        distance: pHash + dHash 해밍 거리 합 (0~128, 작을수록 비슷함)
+        session_id: 세션 ID (세션 디렉터리 밖의 파일이면 None)
+    """
+
+    path: Path
+    distance: int
+    session_id: Optional[str]
+
+
+def image_hashes(image: np.ndarray) -> Tuple[int, int]:
+    """이미지의 (pHash, dHash)를 계산합니다 (회색조 변환은 한 번만)."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    return phash(gray), dhash(gray)
+
+
+class HashIndex:
+    """세션 저장소 루트에 보관되는 지각 해시 색인.
+
+    Args:
+        root: 세션 저장소 루트 (``captures``)
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.index_path = self.root / INDEX_NAME
+        self.paths_path = self.root / PATHS_NAME
+        self._lock = threading.Lock()
+        self._records = np.empty(0, RECORD_DTYPE)
+        self._pending: List[Tuple[int, int]] = []  # 마지막 조회 이후 추가된 해시 (조회 시 배열에 합침)
+        self._paths: List[str] = []
+        self._known = set()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, path: Path) -> bool:
+        return self._relative(path) in self._known
+
+    def _relative(self, path: Path) -> str:
+        path = Path(path)
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _load(self):
+        try:
+            records = np.fromfile(self.index_path, RECORD_DTYPE)
+        except FileNotFoundError:
+            return
+        # 바이트 수가 레코드 크기의 배수가 아니어도 fromfile은 완전한 레코드만 읽음
+        try:
+            paths = self.paths_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            paths = []
+        count = min(len(records), len(paths))
+        if count != len(records) or count != len(paths) or self.index_path.stat().st_size != count * RECORD_DTYPE.itemsize:
+            # 추가 도중 비정상 종료된 경우 두 파일을 같은 길이로 맞춤 (이후 추가가 어긋나지 않도록)
+            print(f"해시 색인 복구: {max(len(records), len(paths)) - count}개 불완전한 항목 제거")
+            records, paths = records[:count], paths[:count]
+            with open(self.index_path, "r+b") as f:
+                f.truncate(count * RECORD_DTYPE.itemsize)
+            self.paths_path.write_text("".join(p + "\n" for p in paths), encoding="utf-8")
+        self._records = records
+        self._paths = paths
+        self._known = set(paths)
+
+    def add(self, path: Path, image: Optional[np.ndarray] = None, hashes: Optional[Tuple[int, int]] = None) -> bool:
+        """이미지 한 장을 색인에 추가합니다 (이미 있으면 건너뜀).
+
+        Args:
+            path: 이미지 파일 경로
+            image: 메모리에 있는 이미지 (없으면 파일에서 읽음)
+            hashes: 미리 계산한 (pHash, dHash)
+
+        Returns:
+            새로 추가했는지 여부
+        """
+        relative = self._relative(path)
+        if relative in self._known:
+            return False
+        if hashes is None:
+            if image is None:
+                image = read_image(Path(path))
+                if image is None:
+                    return False
+            hashes = image_hashes(image)
+
+        record = np.array([hashes], RECORD_DTYPE)
+        with self._lock:
+            if relative in self._known:
+                return False
+            self.root.mkdir(parents=True, exist_ok=True)
+            # 경로를 먼저 기록 - 레코드 기록 전에 중단되면 다음 로드에서 잘라냄
+            with open(self.paths_path, "a", encoding="utf-8") as f:
+                f.write(relative + "\n")
+            with open(self.index_path, "ab") as f:
+                record.tofile(f)
+            self._paths.append(relative)
+            self._known.add(relative)
+            self._pending.append(hashes)
+        return True
+
+    def clear(self):
+        """색인 파일과 메모리의 해시를 모두 지웁니다 (이미지 파일은 그대로)."""
+        with self._lock:
+            for path in (self.index_path, self.paths_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._records = np.empty(0, RECORD_DTYPE)
+            self._pending.clear()
+            self._paths.clear()
+            self._known.clear()
+
+    def build(self, paths: Optional[Iterable[Path]] = None) -> int:
+        """색인에 없는 이미지를 모두 추가합니다.
+
+        Args:
+            paths: 추가할 이미지 경로 (기본: 루트 아래 모든 이미지)
+
+        Returns:
+            새로 추가한 이미지 수
+        """
+        if paths is None:
+            paths = sorted(
+                p for p in self.root.rglob("*")
+                if format_for_path(p) is not None and not p.name.startswith(".") and p.is_file()
+            )
+        added = 0
+        for path in paths:
+            if path not in self and self.add(path):
+                added += 1
+        return added
+
+    def hashes(self) -> np.ndarray:
+        """색인된 모든 해시 레코드 배열 (``RECORD_DTYPE``)."""
+        with self._lock:
+            if self._pending:
+                self._records = np.concatenate([self._records, np.array(self._pending, RECORD_DTYPE)])
+                self._pending.clear()
+            return self._records
+
+    def query(self, image: Optional[np.ndarray] = None, k: int = 5, hashes: Optional[Tuple[int, int]] = None) -> List[HashMatch]:
+        """가장 비슷한 이미지 ``k`` 장을 찾습니다.
+
+        Args:
+            image: 찾을 이미지 (인쇄물 스캔, 사진 등)
+            k: 결과 수
+            hashes: 미리 계산한 (pHash, dHash) - ``image`` 대신 사용
+
+        Returns:
+            거리가 가까운 순서의 결과 목록
+        """
+        if hashes is None:
+            hashes = image_hashes(image)
+        records = self.hashes()
+        if len(records) == 0:
+            return []
+        distances = hamming_distances(records["phash"], hashes[0]).astype(np.uint16)
+        distances += hamming_distances(records["dhash"], hashes[1])
+        k = min(k, len(distances))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        return [self._match(int(i), int(distances[i])) for i in nearest]
+
+    def _match(self, row: int, distance: int) -> HashMatch:
+        relative = self._paths[row]
+        parts = Path(relative).parts
+        path = Path(relative) if Path(relative).is_absolute() else self.root / relative
+        # 세션 디렉터리 구조: <날짜>/<세션 ID>/<파일>
+        session_id = parts[1] if len(parts) == 3 and not Path(relative).is_absolute() else None
+        return HashMatch(path, distance, session_id)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m hash_index", description="Perceptual-hash index over the capture archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index every capture and result not indexed yet")
+    build.add_argument("root", type=Path, nargs="?", default=Path("captures"), help="session store directory (default: captures)")
+    query = commands.add_parser("query", help="find the archived images closest to an image (e.g. a scanned print)")
+    query.add_argument("image", type=Path)
+    query.add_argument("--root", type=Path, default=Path("captures"), help="session store directory (default: captures)")
+    query.add_argument("-k", type=int, default=5, help="number of matches (default: 5)")
+    query.add_argument("--build", action="store_true", help="index new files before querying")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = HashIndex(args.root)
+    print(f"Loaded {len(index)} hashes in {(time.perf_counter() - start) * 1000:.0f} ms")
+    if args.command == "build" or args.build:
+        start = time.perf_counter()
+        added = index.build()
+        print(f"Indexed {added} new images in {time.perf_counter() - start:.1f} s ({len(index)} total)")
+    if args.command == "query":
+        image = read_image(args.image)
+        if image is None:
+            print(f"이미지를 읽을 수 없습니다: {args.image}")
+            return 1
+        start = time.perf_counter()
+        matches = index.query(image, args.k)
+        print(f"Searched {len(index)} hashes in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for match in matches:
+            print(f"{match.distance:4d}  {match.session_id or '-':32s}  {os.path.relpath(match.path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
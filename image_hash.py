@@ -0,0 +1,58 @@
+"""Perceptual image hashes.
+
+사진을 64비트 정수 하나로 요약하는 지각 해시(pHash, dHash)와 해밍 거리 계산입니다.
+크기 변경, 재압축, 약간의 색 보정에도 해시가 거의 바뀌지 않으므로 비슷한 사진(연속 촬영
+중복)이나 인쇄된 결과의 원본을 찾는 데 사용합니다. 해시 배열은 ``np.uint64`` 로 다룹니다.
+"""
+from typing import Union
+
+import cv2
+import numpy as np
+
+HASH_BITS = 64
+
+# 바이트별 1의 개수 (np.bitwise_count가 없는 NumPy 2.0 미만용)
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], np.uint8)
+
+
+def _gray(image: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+
+def _pack(bits: np.ndarray) -> int:
+    return int(np.packbits(bits.ravel()).view(">u8")[0])
+
+
+def phash(image: np.ndarray) -> int:
+    """DCT 기반 지각 해시 (64비트).
+
+    32x32 회색조 이미지의 DCT 저주파 8x8 계수가 중앙값보다 큰지를 비트로 기록합니다.
+    """
+    small = cv2.resize(_gray(image), (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8]
+    # 직류 성분(전체 밝기)은 중앙값 계산에서 제외
+    median = np.median(low.ravel()[1:])
+    return _pack(low > median)
+
+
+def dhash(image: np.ndarray) -> int:
+    """가로 밝기 변화 방향 해시 (64비트). pHash보다 빠르고 밝기 변화에 강함."""
+    small = cv2.resize(_gray(image), (9, 8), interpolation=cv2.INTER_AREA)
+    return _pack(small[:, 1:] > small[:, :-1])
+
+
+def hamming_distances(hashes: np.ndarray, query: Union[int, np.ndarray]) -> np.ndarray:
+    """해시 배열의 각 항목과 ``query`` 사이 해밍 거리를 한 번에 계산합니다.
+
+    Args:
+        hashes: ``np.uint64`` 해시 배열
+        query: 비교할 해시 (정수 또는 ``hashes`` 와 브로드캐스트 가능한 배열)
+
+    Returns:
+        거리 배열 (``np.uint8``, 0~64)
+    """
+    diff = np.bitwise_xor(np.asarray(hashes, np.uint64), np.asarray(query, np.uint64))
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(diff)
+    counts = _POPCOUNT_TABLE[np.ascontiguousarray(diff).view(np.uint8)]
+    return counts.reshape(diff.shape + (8,)).sum(axis=-1, dtype=np.uint8)
@@ -0,0 +1,175 @@
+"""Image encoding/decoding.
+
+캡처와 합성 결과의 저장 형식(PNG 압축 레벨, JPEG/WebP 품질, raw .npy)을 설정하고
+저장할 때마다 인코딩 시간과 파일 크기를 기록합니다.
+"""
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from metrics import default_metrics
+
+EXTENSIONS = {
+    "png": ".png",
+    "jpeg": ".jpg",
+    "webp": ".webp",
+    "npy": ".npy",
+}
+_SUFFIX_TO_FORMAT = {".png": "png", ".jpg": "jpeg", ".jpeg": "jpeg", ".webp": "webp", ".npy": "npy"}
+
+
+@dataclass(frozen=True)
+class EncodeSettings:
+    """저장 형식 설정.
+
+    Attributes:
+        format: "png", "jpeg", "webp", "npy" 중 하나
+        png_compression: PNG 압축 레벨 (0-9, None이면 OpenCV 기본값)
+        quality: JPEG/WebP 품질 (1-100)
+    """
+
+    format: str = "png"
+    png_compression: Optional[int] = None
+    quality: int = 95
+
+    def __post_init__(self):
+        if self.format not in EXTENSIONS:
+            raise ValueError(f"지원하지 않는 저장 형식입니다: {self.format}")
+        # 범위를 벗어난 값은 OpenCV가 경고만 출력하고 잘라 쓰므로 설정 단계에서 거부
+        if self.png_compression is not None and not 0 <= self.png_compression <= 9:
+            raise ValueError(f"PNG 압축 레벨은 0-9 사이여야 합니다: {self.png_compression}")
+        if self.format in ("jpeg", "webp") and not 1 <= self.quality <= 100:
+            raise ValueError(f"{self.format.upper()} 품질은 1-100 사이여야 합니다: {self.quality}")
+
+    @property
+    def extension(self) -> str:
+        return EXTENSIONS[self.format]
+
+    def params(self) -> List[int]:
+        """``cv2.imencode`` 에 넘길 파라미터 목록."""
+        if self.format == "png" and self.png_compression is not None:
+            return [cv2.IMWRITE_PNG_COMPRESSION, self.png_compression]
+        if self.format == "jpeg":
+            return [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        if self.format == "webp":
+            return [cv2.IMWRITE_WEBP_QUALITY, self.quality]
+        return []
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "EncodeSettings":
+        """``png``, ``png:1``, ``jpeg:90``, ``webp:80``, ``npy`` 형식의 문자열을 해석합니다."""
+        name, _, level = spec.strip().lower().partition(":")
+        if name == "jpg":
+            name = "jpeg"
+        if level and not level.isdigit():
+            raise ValueError(f"압축 레벨/품질은 정수여야 합니다: {spec}")
+        if name == "png":
+            return cls("png", png_compression=int(level) if level else None)
+        if name in ("jpeg", "webp"):
+            return cls(name, quality=int(level) if level else cls.quality)
+        return cls(name)
+
+    @classmethod
+    def for_path(cls, path: Path) -> "EncodeSettings":
+        """파일 확장자로 기본 설정을 고릅니다."""
+        return cls(_SUFFIX_TO_FORMAT.get(path.suffix.lower(), "png"))
+
+
+def format_for_path(path: Path) -> Optional[str]:
+    """파일 확장자에 해당하는 저장 형식 이름 (지원하지 않는 확장자면 None)."""
+    return _SUFFIX_TO_FORMAT.get(path.suffix.lower())
+
+
+def write_image(path: Path, image: np.ndarray, settings: Optional[EncodeSettings] = None, durable: bool = False) -> bool:
+    """이미지를 설정된 형식으로 저장하고 인코딩 시간/크기를 기록합니다.
+
+    Args:
+        path: 출력 파일 경로 (확장자는 설정 형식과 일치해야 함)
+        image: 저장할 BGR(A) 이미지
+        settings: 저장 형식. None이면 확장자로 결정
+        durable: True이면 임시 파일에 기록하고 fsync 후 원자적으로 교체합니다.
+            반환 시점에 파일이 완전히 디스크에 기록되어 있으므로 바로 복사/다운로드 가능
+
+    Returns:
+        성공 여부
+    """
+    if settings is None:
+        settings = EncodeSettings.for_path(path)
+    elif _SUFFIX_TO_FORMAT.get(path.suffix.lower()) != settings.format:
+        raise ValueError(f"파일 확장자가 저장 형식({settings.format})과 맞지 않습니다: {path}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    target = path.with_name(f".{path.name}.tmp") if durable else path
+    start = time.perf_counter()
+    if settings.format == "npy":
+        # raw 형식은 인코딩 없이 바로 기록
+        buffer = None
+        encode_ms = 0.0
+    else:
+        ok, buffer = cv2.imencode(settings.extension, image, settings.params())
+        if not ok:
+            return False
+        encode_ms = (time.perf_counter() - start) * 1000
+
+    try:
+        with open(target, "wb") as f:
+            if buffer is None:
+                np.save(f, np.ascontiguousarray(image))
+            else:
+                buffer.tofile(f)
+            size = f.tell()
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        if durable:
+            os.replace(target, path)
+            _fsync_directory(path.parent)
+    except OSError:
+        if durable and target.exists():
+            target.unlink()
+        raise
+    write_ms = (time.perf_counter() - start) * 1000 - encode_ms
+
+    metrics = default_metrics()
+    if buffer is not None:
+        metrics.observe(f"encode.{settings.format}", encode_ms)
+    metrics.observe("disk.write", write_ms)
+    metrics.count("disk.bytes_written", size)
+    # 형식별 파일 크기 (평균 = bytes / files) - 키오스크마다 형식/품질을 고를 때 인코딩 시간과 함께 비교
+    metrics.count(f"bytes.{settings.format}", size)
+    metrics.count(f"files.{settings.format}", 1)
+    metrics.gauge(f"last_bytes.{settings.format}", size)
+    return True
+
+
+def _fsync_directory(directory: Path):
+    # 이름 변경(os.replace)까지 디스크에 확정 (디렉터리 fsync를 지원하지 않는 플랫폼은 무시)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_image(path: Path, flags: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+    """이미지 파일을 읽습니다. ``.npy`` 는 메모리 매핑으로 엽니다.
+
+    Returns:
+        이미지 배열. 읽을 수 없으면 None
+    """
+    if path.suffix.lower() == ".npy":
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+    return cv2.imread(str(path), flags)
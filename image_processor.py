@@ -3,19 +3,47 @@
 Helper functions to transform frames before saving or displaying.
 """
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Union
 
 import cv2
 import numpy as np
 
+from compositor import StripLayout, compose_strip
+from frame_registry import default_registry
+from image_io import EncodeSettings, read_image, write_image
+from metrics import default_metrics
+from templates import LayoutTemplate, load_template, render_template
 
-def combine_three_images(image_paths: List[Path], output_path: Path, layout: str = "vertical") -> bool:
+ImageSource = Union[Path, np.ndarray]  # 파일 경로 또는 메모리에 있는 BGR 배열
+
+
+def load_image(source: ImageSource, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+    """경로이면 파일을 읽고, 배열이면 그대로 반환합니다."""
+    if isinstance(source, np.ndarray):
+        return source
+    if not source.exists():
+        raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {source}")
+    img = read_image(source, flags)
+    if img is None:
+        raise ValueError(f"이미지를 로드할 수 없습니다: {source}")
+    return img
+
+
+def combine_three_images(
+    image_paths: List[ImageSource],
+    output_path: Path,
+    layout: Union[str, StripLayout] = "vertical",
+    encoding: Optional[EncodeSettings] = None,
+    interpolation: int = cv2.INTER_LANCZOS4,
+) -> bool:
     """3장의 이미지를 합성하여 하나의 이미지로 만듭니다.
     
     Args:
-        image_paths: 합성할 이미지 파일 경로 리스트 (3장)
+        image_paths: 합성할 이미지 파일 경로 또는 BGR 배열 리스트 (3장)
         output_path: 출력 파일 경로
-        layout: 배치 방식 ("vertical" 또는 "horizontal")
+        layout: 배치 방식 ("vertical" 또는 "horizontal") 또는 여백/간격/배경색까지 지정한 ``StripLayout``
+        encoding: 저장 형식 (None이면 출력 파일 확장자로 결정)
+        interpolation: 리사이즈 보간법 (``layout`` 이 문자열일 때만 사용, 기본: 인쇄 품질용 LANCZOS4)
     
     Returns:
         성공 여부
@@ -24,106 +52,103 @@ def combine_three_images(image_paths: List[Path], output_path: Path, layout: str
         raise ValueError("정확히 3장의 이미지가 필요합니다.")
     
     try:
-        # 이미지 로드
-        images = []
-        for img_path in image_paths:
-            if not img_path.exists():
-                raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {img_path}")
-            
-            img = cv2.imread(str(img_path))
-            if img is None:
-                raise ValueError(f"이미지를 로드할 수 없습니다: {img_path}")
-            
-            images.append(img)
+        # 이미지 로드 (배열은 그대로 사용)
+        images = [load_image(source) for source in image_paths]
         
-        # 모든 이미지를 같은 너비로 리사이즈 (세로 배치의 경우)
-        if layout == "vertical":
-            # 가장 넓은 이미지의 너비에 맞춤
-            max_width = max(img.shape[1] for img in images)
-            resized_images = []
-            for img in images:
-                height = int(img.shape[0] * (max_width / img.shape[1]))
-                resized = cv2.resize(img, (max_width, height), interpolation=cv2.INTER_LANCZOS4)
-                resized_images.append(resized)
-            
-            # 세로로 연결
-            combined = np.vstack(resized_images)
+        if isinstance(layout, str):
+            layout = StripLayout(orientation=layout, interpolation=interpolation)
         
-        elif layout == "horizontal":
-            # 가장 높은 이미지의 높이에 맞춤
-            max_height = max(img.shape[0] for img in images)
-            resized_images = []
-            for img in images:
-                width = int(img.shape[1] * (max_height / img.shape[0]))
-                resized = cv2.resize(img, (width, max_height), interpolation=cv2.INTER_LANCZOS4)
-                resized_images.append(resized)
-            
-            # 가로로 연결
-            combined = np.hstack(resized_images)
-        
-        else:
-            raise ValueError("layout은 'vertical' 또는 'horizontal'이어야 합니다.")
+        # 캔버스를 한 번만 할당하고 각 사진을 해당 영역에 직접 리사이즈
+        with default_metrics().timer("composite.strip"):
+            combined = compose_strip(images, layout)
         
         # 결과 저장
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        success = cv2.imwrite(str(output_path), combined)
-        
-        return success
+        return write_image(output_path, combined, encoding)
     
     except Exception as e:
         print(f"이미지 합성 오류: {e}")
         return False
 
 
-def add_frame_to_image(image_path: Path, frame_path: Path, output_path: Path) -> bool:
+def combine_images(
+    image_paths: List[ImageSource],
+    output_path: Path,
+    template: Optional[LayoutTemplate] = None,
+    encoding: Optional[EncodeSettings] = None,
+    interpolation: int = cv2.INTER_LANCZOS4,
+) -> bool:
+    """레이아웃 템플릿에 맞춰 여러 장의 이미지를 하나로 합성합니다.
+    
+    Args:
+        image_paths: 합성할 이미지 파일 경로 또는 BGR 배열 리스트 (템플릿 슬롯 수만큼)
+        output_path: 출력 파일 경로
+        template: 레이아웃 템플릿 (None이면 기본 템플릿)
+        encoding: 저장 형식 (None이면 출력 파일 확장자로 결정)
+        interpolation: 리사이즈 보간법 (기본: 인쇄 품질용 LANCZOS4)
+    
+    Returns:
+        성공 여부
+    """
+    template = template or load_template()
+    if len(image_paths) != template.select_count:
+        raise ValueError(f"정확히 {template.select_count}장의 이미지가 필요합니다.")
+    
+    try:
+        images = [load_image(source) for source in image_paths]
+        combined = render_template(images, template, interpolation)
+        return write_image(output_path, combined, encoding)
+    
+    except Exception as e:
+        print(f"이미지 합성 오류: {e}")
+        return False
+
+
+def add_frame_to_image(
+    image_path: ImageSource,
+    frame_path: Union[Path, str],
+    output_path: Path,
+    encoding: Optional[EncodeSettings] = None,
+) -> bool:
     """이미지에 프레임을 추가합니다.
     
     Args:
-        image_path: 원본 이미지 경로
-        frame_path: 프레임 이미지 경로
+        image_path: 원본 이미지 경로 또는 BGR 배열
+        frame_path: 프레임 이미지 경로 또는 ``assets/frames`` 에 등록된 프레임 이름
         output_path: 출력 파일 경로
+        encoding: 저장 형식 (None이면 출력 파일 확장자로 결정)
     
     Returns:
         성공 여부
     """
     try:
-        # 이미지와 프레임 로드
-        img = cv2.imread(str(image_path))
-        frame = cv2.imread(str(frame_path), cv2.IMREAD_UNCHANGED)
+        # 이미지 로드 (배열은 그대로 사용)
+        img = image_path if isinstance(image_path, np.ndarray) else read_image(image_path)
+        if img is None:
+            return False
         
-        if img is None or frame is None:
+        # 프레임은 레지스트리에서 한 번만 디코딩되고, 출력 크기별 준비 결과도 캐시됨
+        overlay = default_registry().overlay(frame_path, (img.shape[1], img.shape[0]))
+        if overlay is None:
             return False
         
-        # 프레임이 투명도 채널이 있는 경우 (RGBA)
-        if frame.shape[2] == 4:
-            # 알파 채널을 마스크로 사용
-            alpha = frame[:, :, 3] / 255.0
-            frame_rgb = frame[:, :, :3]
-            
-            # 이미지와 프레임 크기 맞추기
-            if img.shape[:2] != frame.shape[:2]:
-                frame_rgb = cv2.resize(frame_rgb, (img.shape[1], img.shape[0]))
-                alpha = cv2.resize(alpha, (img.shape[1], img.shape[0]))
-            
-            # alpha를 3차원으로 확장 (채널 차원 추가)
-            if len(alpha.shape) == 2:
-                alpha = alpha[:, :, np.newaxis]
-            
-            # 블렌딩
-            result = (img * (1 - alpha) + frame_rgb * alpha).astype(np.uint8)
-        else:
-            # 투명도가 없는 경우 단순 오버레이
-            if img.shape[:2] != frame.shape[:2]:
-                frame = cv2.resize(frame, (img.shape[1], img.shape[0]))
-            
-            result = cv2.addWeighted(img, 0.7, frame, 0.3, 0)
+        # 투명도가 있으면 uint16 고정소수점 블렌딩, 없으면 단순 오버레이 (0.7:0.3)
+        with default_metrics().timer("composite.overlay"):
+            result = overlay.apply(img)
         
         # 결과 저장
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        success = cv2.imwrite(str(output_path), result)
-        
-        return success
+        return write_image(output_path, result, encoding)
     
     except Exception as e:
         print(f"프레임 추가 오류: {e}")
         return False
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != "batch":
+        print("usage: python -m image_processor batch <source> [options]")
+        sys.exit(2)
+    from batch import main
+
+    sys.exit(main(sys.argv[2:]))
@@ -1,13 +1,35 @@
+import argparse
+import math
+import os
+import shutil
 import sys
+import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 import cv2
-from PyQt5.QtCore import Qt, QTimer, QSize
-from PyQt5.QtGui import QImage, QPixmap, QIcon
+import numpy as np
+from PyQt5.QtCore import QEvent, Qt, QTimer, QSize, pyqtSignal
+from PyQt5.QtGui import QIcon
 
-from image_processor import combine_three_images
+from camera import CaptureThread
+from capture_scheduler import CaptureSchedule
+from capture_session import CaptureSession, pixmap_nbytes
+from capture_writer import CaptureWriter
+from frame_scoring import best_frame
+from frame_source import FrameSource, open_frame_source
+from exporter import EXPORT_FORMATS, Exporter
+from hash_index import HashIndex, image_hashes
+from image_io import EncodeSettings, format_for_path, read_image
+from metrics import METRICS_ENV_VAR, current_rss, default_metrics
+from preview import PreviewRenderer, ndarray_to_pixmap
+from result_composer import ResultComposer
+from session_store import SessionLog, SessionStore
+from soak import run_soak
+from styles import load_stylesheet, set_style_state
+from templates import LayoutTemplate, load_template
 from PyQt5.QtWidgets import (
     QApplication,
     QDialog,
@@ -30,37 +52,88 @@ class PhotoBoothWindow(QMainWindow):
 
     STREAM_INTERVAL_MS = 30
     COUNTDOWN_SECONDS = 5  # 초기 카운트다운 5초
-    COUNTDOWN_INTERVAL_MS = 1000
     CAPTURE_INTERVAL_SECONDS = 5  # 촬영 사이 카운트다운 5초
-    CAPTURE_INTERVAL_MS = 5000
-    MAX_CAPTURES = 8  # 8장 촬영
-    SELECT_COUNT = 3  # 그 중 3장 선택
+    SCHEDULE_TICK_MS = 20  # 촬영 일정 확인 간격 (카운트다운 표시 갱신 및 마감 시각 확인)
+    SHOT_GRACE_S = 0.1  # 후보 범위가 끝난 뒤 다음 프레임을 기다리는 최대 시간
+    BURST_PRE_S = 0.1  # 촬영 시각 이전 프레임 중 후보로 삼을 범위 (버스트 모드)
+    BURST_POST_S = 0.1  # 촬영 시각 이후 프레임 중 후보로 삼을 범위 (버스트 모드)
+    CAPTURE_HISTORY_FRAMES = 8  # 카메라 링 버퍼 최소 크기 (GUI가 멈춰도 마감 시각 부근 프레임을 고를 수 있도록)
+    MAX_HISTORY_FRAMES = 24  # 링 버퍼 최대 크기 (1080p 기준 약 150 MB) - 넘으면 버스트 범위를 줄임
+    HISTORY_MARGIN_FRAMES = 3  # 기록 중인 슬롯 + 범위가 끝난 뒤 일정 확인까지 도착하는 프레임
+    DEFAULT_SOURCE_FPS = 30.0  # 소스가 fps를 알려 주지 않을 때 가정하는 값
+    MAX_CAPTURES = 8  # 8장 촬영 (기본 3컷 기준 - 실제 값은 템플릿에서 설정)
+    SELECT_COUNT = 3  # 그 중 3장 선택 (기본 3컷 기준 - 실제 값은 템플릿에서 설정)
     THUMBNAIL_WIDTH = 350  # 갤러리 썸네일 너비 (2열 그리드에 맞춤)
     THUMBNAIL_HEIGHT = 200  # 갤러리 썸네일 최대 높이 (더 작게 설정)
+    RELAYOUT_INTERVAL_MS = 16  # 갤러리 재배치 최소 간격 (약 60Hz)
+    LATE_TICK_FACTOR = 1.5  # 미리보기 타이머 간격이 이 배수를 넘으면 늦은 틱으로 집계
+    METRICS_OVERLAY_INTERVAL_MS = 500
+    METRICS_DUMP_INTERVAL_MS = 10000
+    # 오버레이에 표시할 단계별 소요 시간
+    METRICS_OVERLAY_TIMINGS = ["camera.read", "preview.scale", "preview.convert", "thumbnail.pyramid", "disk.write"]
 
-    def __init__(self):
+    def __init__(
+        self,
+        frame_source: FrameSource = None,
+        encoding: EncodeSettings = None,
+        template: LayoutTemplate = None,
+        metrics_path: Optional[Path] = None,
+        metrics_overlay: bool = False,
+        burst: bool = True,
+        check_blink: bool = False,
+        captures_root: Optional[Path] = None,
+    ):
         super().__init__()
         self.setWindowTitle("3-Cut Photo Booth")
         self.resize(1280, 800)
+        self.encoding = encoding or EncodeSettings()  # 캡처/합성 결과 저장 형식
+        # 촬영/선택 장수는 결과 레이아웃 템플릿이 결정 (3컷, 2x2, 4컷 등)
+        self.template = template or load_template()
+        self.MAX_CAPTURES = self.template.capture_count
+        self.SELECT_COUNT = self.template.select_count
+        # 상태별 스타일(선택/완료 버튼 등)은 전역 스타일시트의 동적 속성으로 처리
+        self.setStyleSheet(load_stylesheet())
 
         # State holders
         self.current_frame = None
-        self.countdown_remaining = self.COUNTDOWN_SECONDS
-        self.capture_countdown_remaining = 0  # 촬영 사이 카운트다운
+        self.capture_schedule: CaptureSchedule = None  # 진행 중인 자동 촬영 일정
+        self.countdown_shown = None  # 오버레이에 표시 중인 남은 초
         self.captured_frames = []
-        self.selected_frames = []  # 선택된 3장
-        self.output_dir = Path.cwd() / "captures"
-        self.output_dir.mkdir(exist_ok=True)
-        self.is_capture_countdown = False  # 촬영 사이 카운트다운 중인지
+        self.selected_frames = []  # 선택된 사진 (SELECT_COUNT장)
+        # 세션마다 captures/<날짜>/<세션 ID>/ 에 저장하고 매니페스트/인덱스에 기록
+        self.session_store = SessionStore(captures_root or Path.cwd() / "captures")
+        # 인쇄된 결과로 원본 세션을 찾을 수 있도록 캡처/결과 파일의 지각 해시를 색인
+        self.hash_index = HashIndex(self.session_store.root)
+        self.capture_hashes = {}  # 저장 완료를 기다리는 캡처의 (pHash, dHash)
+        self.capture_logs: Dict[Path, SessionLog] = {}  # 저장 완료를 기다리는 캡처를 촬영한 세션
         self.gallery_labels = []  # 갤러리 썸네일 레이블들
-        self.gallery_label_to_file = {}  # 레이블에서 파일 경로로 매핑
-        self.gallery_label_size = {}  # 레이블의 원본 크기 저장 (width, height)
+        self.gallery_label_to_index = {}  # 레이블에서 캡처 번호로 매핑
+        self.gallery_label_size = {}  # 레이블에 적용된 썸네일 크기 (width, height)
         self.selected_gallery_labels = []  # 선택된 갤러리 레이블들
 
-        # Webcam setup
-        self.capture = cv2.VideoCapture(0, cv2.CAP_AVFOUNDATION)
-        if not self.capture.isOpened():
-            raise RuntimeError("Cannot open default webcam")
+        # Camera setup - 읽기는 전용 캡처 스레드에서 수행
+        if frame_source is None:
+            frame_source = open_frame_source()
+        fps = frame_source.frame_rate() if isinstance(frame_source, FrameSource) else 0.0
+        ring_size, self.burst_pre_s, self.burst_post_s = self.plan_history(fps or self.DEFAULT_SOURCE_FPS)
+        self.camera = CaptureThread(frame_source, ring_size=ring_size)
+        self.camera.start()
+        self.last_frame_seq = 0  # 마지막으로 그린 프레임의 시퀀스 번호
+        self.last_stream_tick = None  # 늦은 타이머 틱 판정용 (time.monotonic)
+        self.metrics = default_metrics()
+        self.metrics_path = metrics_path
+        # 버스트 모드: 촬영 시각 앞뒤 프레임 중 가장 선명한 프레임을 저장
+        self.burst = burst
+        self.check_blink = check_blink
+        self.preview_renderer = PreviewRenderer()
+
+        # 캡처 저장은 백그라운드 작성기에서 수행 (GUI 스레드에서 PNG 인코딩하지 않음)
+        self.capture_writer = CaptureWriter(self.encoding, parent=self)
+        self.capture_writer.saved.connect(self.on_capture_saved)
+
+        # 세션 동안의 캡처 프레임/썸네일/QPixmap/합성 결과는 세션 객체가 소유하고 종료 시 한 번에 해제
+        # (선택/합성 시 PNG를 다시 디코딩하지 않고, 캡처 점수로 상위 사진을 미리 선택)
+        self.capture_session = CaptureSession(loader=self._load_capture)
 
         # UI construction
         central = QWidget(self)
@@ -101,6 +174,23 @@ class PhotoBoothWindow(QMainWindow):
         )
         self.countdown_overlay.hide()
 
+        # 성능 지표 오버레이 (--metrics-overlay)
+        self.metrics_overlay = QLabel(self.preview_label)
+        self.metrics_overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.metrics_overlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 0.6); "
+            "color: #7CFC00; "
+            "font-family: monospace; "
+            "font-size: 11px; "
+            "padding: 4px;"
+        )
+        self.metrics_overlay.move(8, 8)
+        self.metrics_overlay.hide()
+
+        # 미리보기 크기가 바뀔 때만 렌더 대상 크기와 오버레이 크기를 갱신
+        self.preview_renderer.set_target_size(self.preview_label.size())
+        self.preview_label.installEventFilter(self)
+
         self.status_label = QLabel("Ready to record", self)
         self.status_label.setAlignment(Qt.AlignCenter)
         self.status_label.setStyleSheet("font-size: 22px; padding: 12px;")
@@ -137,79 +227,47 @@ class PhotoBoothWindow(QMainWindow):
         self.gallery_grid.setColumnStretch(1, 1)
         self.gallery_grid.setColumnMinimumWidth(0, 0)
         self.gallery_grid.setColumnMinimumWidth(1, 0)
-        # 4행 설정 (초기 최소 높이 설정)
+        # 행 설정 (2열 기준 행 수는 촬영 장수에 따름, 초기 최소 높이 설정)
         INITIAL_MIN_HEIGHT = 100 # 초기값, 동적으로 덮어씌워질 예정
-        for i in range(4):
+        rows = (self.MAX_CAPTURES + 1) // 2
+        for i in range(rows):
             self.gallery_grid.setRowMinimumHeight(i, INITIAL_MIN_HEIGHT)
             self.gallery_grid.setRowStretch(i, 0)  # 고정 높이이므로 stretch 제거
         
         # 그리드 위젯 크기 정책 설정
-        # 너비는 스크롤 영역에 맞춰지고, 높이는 고정 (4행 × THUMBNAIL_HEIGHT)
+        # 너비는 스크롤 영역에 맞춰지고, 높이는 고정 (행 수 × THUMBNAIL_HEIGHT)
         self.gallery_grid_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         # 그리드 위젯의 최소/최대 높이 설정 (INITIAL_MIN_HEIGHT 사용)
-        grid_height = 4 * INITIAL_MIN_HEIGHT
+        grid_height = rows * INITIAL_MIN_HEIGHT
         self.gallery_grid_widget.setMinimumHeight(grid_height)
         self.gallery_grid_widget.setMaximumHeight(grid_height)
         
         self.gallery_scroll.setWidget(self.gallery_grid_widget)
         
-        # 그리드 위젯 너비를 viewport 너비에 맞추는 함수 (높이 동적 계산 추가)
-        def update_grid_width():
-            if hasattr(self, 'gallery_scroll') and hasattr(self, 'gallery_grid_widget'):
-                viewport_width = self.gallery_scroll.viewport().width()
-                if viewport_width > 0:
-
-                    # 1. 여백 및 마진 값 가져오기
-                    grid_spacing = self.gallery_grid.spacing() # 10px
-                    # 좌우 마진 합계
-                    grid_margin = (self.gallery_grid.contentsMargins().left() + 
-                                   self.gallery_grid.contentsMargins().right())
-
-                    # 2. 썸네일 너비 계산 (뷰포트 너비의 절반)
-                    # 유효 너비 = 뷰포트 너비 - 좌우 마진 - 2개 열 사이 간격 1개
-                    effective_content_width = viewport_width - grid_margin - grid_spacing
-                    thumbnail_width = effective_content_width / 2
-
-                    # 3. 썸네일 높이 계산 (최종 사진 비율 3:4 적용)
-                    THUMBNAIL_ASPECT_RATIO = 3 / 4
-                    new_thumbnail_height = int(thumbnail_width * THUMBNAIL_ASPECT_RATIO)
-
-                    # 4. 갤러리 그리드 행 높이 업데이트
-                    for i in range(4):
-                        self.gallery_grid.setRowMinimumHeight(i, new_thumbnail_height)
-                    
-                    # 5. 갤러리 위젯의 고정 높이 업데이트 (4행 기준)
-                    # 높이 = (4행 * 높이) + (3개 행 사이 간격) + (상하 마진)
-                    grid_height = 4 * new_thumbnail_height + (3 * grid_spacing)+ (self.gallery_grid.contentsMargins().top() + self.gallery_grid.contentsMargins().bottom())
-                    self.gallery_grid_widget.setMinimumHeight(grid_height)
-                    self.gallery_grid_widget.setMaximumHeight(grid_height)
-
-                    # 6. 그리드 위젯의 최대 너비를 설정
-                    self.gallery_grid_widget.setMaximumWidth(viewport_width)
-                    self.gallery_grid_widget.updateGeometry()
-                    
-                    # 7. 갤러리 내 썸네일 위젯 크기 업데이트
-                    if hasattr(self, 'update_thumbnails_size'):
-                        self.update_thumbnails_size(new_thumbnail_height, int(thumbnail_width))
-
-        # 그리드 너비 업데이트 함수 저장 (resizeEvent에서 사용)
-        self._update_grid_width_func = update_grid_width
-        
+        # 갤러리 재배치는 타이머로 묶어서 프레임 간격당 최대 한 번만 수행
+        self.gallery_thumbnail_size = None  # 마지막으로 적용한 (너비, 높이)
+        self.timer_relayout = QTimer(self)
+        self.timer_relayout.setSingleShot(True)
+        self.timer_relayout.setInterval(self.RELAYOUT_INTERVAL_MS)
+        self.timer_relayout.timeout.connect(self.update_grid_width)
+        # 스플리터 이동 등 창 크기 변화 없이 viewport만 바뀌는 경우도 감지
+        self.gallery_scroll.viewport().installEventFilter(self)
+
         # 초기 크기 설정 (창이 표시된 후)
-        QTimer.singleShot(100, update_grid_width)
+        QTimer.singleShot(100, self.update_grid_width)
 
         # 선택 상태 표시 레이블
-        self.selection_label = QLabel("Select photos (0/3)", self)
+        self.selection_label = QLabel(f"Select photos (0/{self.SELECT_COUNT})", self)
         self.selection_label.setAlignment(Qt.AlignCenter)
         self.selection_label.setStyleSheet("font-size: 16px; padding: 8px;")
 
         gallery_top_layout = QVBoxLayout(gallery_top)
         gallery_top_layout.setContentsMargins(5, 5, 5, 5)
-        gallery_top_layout.addWidget(QLabel("Captured Photos (Select 3 of 8)", self))
+        gallery_top_layout.addWidget(QLabel(f"Captured Photos (Select {self.SELECT_COUNT} of {self.MAX_CAPTURES})", self))
         gallery_top_layout.addWidget(self.gallery_scroll, stretch=1)
         gallery_top_layout.addWidget(self.selection_label)
 
-        # 하단: 선택된 3장 미리보기
+        # 하단: 선택된 사진 미리보기
         preview_bottom = QWidget(self)
         preview_bottom.setMinimumHeight(250)
         
@@ -223,7 +281,7 @@ class PhotoBoothWindow(QMainWindow):
         preview_title.setStyleSheet("font-size: 16px; font-weight: bold; padding: 5px;")
         preview_bottom_layout.addWidget(preview_title)
         
-        # 선택된 3장을 표시할 레이블들 (가로 레이아웃)
+        # 선택된 사진을 표시할 레이블들 (가로 레이아웃)
         self.selected_preview_layout = QHBoxLayout()
         self.selected_preview_layout.setSpacing(10)
         self.selected_preview_labels = []
@@ -232,27 +290,16 @@ class PhotoBoothWindow(QMainWindow):
             label.setAlignment(Qt.AlignCenter)
             label.setMinimumSize(140, 160)
             label.setMaximumSize(200, 200)
-            label.setStyleSheet(
-                "border: 2px dashed #ccc; "
-                "background-color: #f0f0f0; "
-                "color: #999; "
-                "font-size: 14px;"
-            )
+            label.setObjectName("selectedPreviewSlot")
             self.selected_preview_labels.append(label)
             self.selected_preview_layout.addWidget(label)
         
         preview_bottom_layout.addLayout(self.selected_preview_layout)
         
         # 선택 완료 버튼
-        self.finalize_button = QPushButton("Complete Selection (0/3 Photos)", self)
-        self.finalize_button.setStyleSheet(
-            "padding: 15px 30px; "
-            "font-size: 18px; "
-            "font-weight: bold; "
-            "background-color: #9E9E9E; "
-            "color: white; "
-            "border-radius: 5px;"
-        )
+        self.finalize_button = QPushButton(f"Complete Selection (0/{self.SELECT_COUNT} Photos)", self)
+        self.finalize_button.setObjectName("finalizeButton")
+        self.finalize_button.setProperty("ready", False)
         self.finalize_button.setEnabled(False)
         self.finalize_button.clicked.connect(self.finalize_selection)
         preview_bottom_layout.addWidget(self.finalize_button)
@@ -272,38 +319,76 @@ class PhotoBoothWindow(QMainWindow):
 
         # Timer B: countdown (초기 카운트다운 및 촬영 사이 카운트다운)
         self.timer_countdown = QTimer(self)
+        self.timer_countdown.setTimerType(Qt.PreciseTimer)
         self.timer_countdown.timeout.connect(self.update_countdown)
 
+        # Timer C: 성능 지표 오버레이 갱신 및 주기적 덤프 (선택)
+        self.timer_metrics_overlay = QTimer(self)
+        self.timer_metrics_overlay.timeout.connect(self.update_metrics_overlay)
+        if metrics_overlay:
+            self.metrics_overlay.show()
+            self.timer_metrics_overlay.start(self.METRICS_OVERLAY_INTERVAL_MS)
+        self.timer_metrics_dump = QTimer(self)
+        self.timer_metrics_dump.timeout.connect(self.dump_metrics)
+        if self.metrics_path is not None:
+            self.timer_metrics_dump.start(self.METRICS_DUMP_INTERVAL_MS)
+
     # ---- Timer / capture handlers -------------------------------------------------
 
     def update_frame(self):
         """Timer A callback: fetches latest frame and renders into the preview."""
+        now = time.monotonic()
+        if self.last_stream_tick is not None and now - self.last_stream_tick > self.STREAM_INTERVAL_MS * self.LATE_TICK_FACTOR / 1000:
+            # GUI 스레드가 다른 작업에 막혀 타이머가 제때 실행되지 못함
+            self.metrics.count("preview.late_ticks")
+        self.last_stream_tick = now
         try:
-            ok, frame = self.capture.read()
-            if not ok:
+            seq, frame = self.camera.latest()
+            if frame is None or self.camera.signal_lost:
                 self.preview_label.setText("No Camera Signal")
                 return
 
-            if frame is None or frame.size == 0:
+            if seq == self.last_frame_seq:
+                # 새 프레임이 없으면 다시 그리지 않음
                 return
+            if self.last_frame_seq and seq > self.last_frame_seq + 1:
+                # 캡처 스레드가 만든 프레임 중 화면에 그려지지 못한 프레임
+                self.metrics.count("preview.dropped_frames", seq - self.last_frame_seq - 1)
+            self.last_frame_seq = seq
 
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = frame_rgb.shape
-            image = QImage(frame_rgb.data, w, h, ch * w, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(image)
-            scaled = pixmap.scaled(
-                self.preview_label.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation,
-            )
-            self.preview_label.setPixmap(scaled)
-            self.flash_overlay.resize(self.preview_label.size())
-            self.countdown_overlay.resize(self.preview_label.size())
+            pixmap = self.preview_renderer.render(frame)
+            if pixmap is not None:
+                self.preview_label.setPixmap(pixmap)
+                self.metrics.tick("preview.frames")
             self.current_frame = frame
         except Exception as e:
             # 예외 발생 시에도 앱이 계속 실행되도록
+            self.metrics.count("preview.errors")
             print(f"Frame update error: {e}")  # 디버깅용
 
+    def update_metrics_overlay(self):
+        """Timer C callback: 미리보기 위에 FPS와 단계별 소요 시간을 표시합니다."""
+        usage = self.record_memory_usage()
+        memory = "  ".join(f"{name} {value / 2**20:.1f}" for name, value in usage.items() if value)
+        self.metrics_overlay.setText(f"{self.metrics.summary(self.METRICS_OVERLAY_TIMINGS)}\nmemory MB: {memory}")
+        self.metrics_overlay.adjustSize()
+        self.metrics_overlay.raise_()
+
+    def record_memory_usage(self) -> Dict[str, int]:
+        """분류별 메모리 사용량과 RSS를 ``memory.*`` 게이지로 기록합니다."""
+        usage = self.memory_usage()
+        usage["rss"] = current_rss()
+        for name, value in usage.items():
+            self.metrics.gauge(f"memory.{name}", value)
+        return usage
+
+    def dump_metrics(self):
+        self.record_memory_usage()
+        try:
+            self.metrics.dump(self.metrics_path)
+        except OSError as e:
+            print(f"Metrics dump error: {e}")
+
     def begin_countdown(self):
         """Triggered by the start button to initiate Timer B."""
         if self.timer_countdown.isActive():
@@ -313,168 +398,178 @@ class PhotoBoothWindow(QMainWindow):
             self.status_label.setText("Camera is initialising...")
             return
 
-        # 재시작 시 상태 초기화
-        self.captured_frames = []
-        self.selected_frames = []
-        self.selected_gallery_labels = []
-        
-        # 갤러리 그리드 초기화
-        for label in self.gallery_labels:
-            self.gallery_grid.removeWidget(label)
-            label.deleteLater()
-        self.gallery_labels.clear()
-        self.gallery_label_to_file.clear()
-        self.gallery_label_size.clear()  # 크기 정보도 초기화
-        
-        self.finalize_button.setEnabled(False)
-        self.finalize_button.setText("Complete Selection (0/3 Photos)")
-        self.finalize_button.setStyleSheet(
-            "padding: 15px 30px; "
-            "font-size: 18px; "
-            "font-weight: bold; "
-            "background-color: #9E9E9E; "
-            "color: white; "
-            "border-radius: 5px;"
-        )
-        self.selection_label.setText("Select photos (0/3)")
+        # 재시작 시 이전 세션 버퍼를 해제하고 새 세션 시작 (이전 세션 파일은 덮어쓰지 않음)
+        self.start_session()
         self.countdown_overlay.hide()
-        self.is_capture_countdown = False
-        
-        # 선택된 미리보기 초기화
-        for i, label in enumerate(self.selected_preview_labels):
-            label.clear()
-            label.setText(f"Photo {i + 1}")
 
-        self.countdown_remaining = self.COUNTDOWN_SECONDS
-        self.status_label.setText(f"Ready to record... {self.countdown_remaining}")
         self.start_button.setEnabled(False)
         self.start_button.setText("Action!")
-        # 초기 카운트다운 시작 (큰 숫자 표시)
-        self.countdown_overlay.setText(str(self.countdown_remaining))
-        self.countdown_overlay.show()
-        self.timer_countdown.start(self.COUNTDOWN_INTERVAL_MS)
+        # 모든 촬영 시각을 지금 기준으로 미리 계산 (카운트다운은 이 일정을 표시만 함)
+        self.capture_schedule = CaptureSchedule(self.MAX_CAPTURES, self.COUNTDOWN_SECONDS, self.CAPTURE_INTERVAL_SECONDS)
+        self.countdown_shown = None
+        self.timer_countdown.start(self.SCHEDULE_TICK_MS)
+        self.update_countdown()
+
+    @classmethod
+    def plan_history(cls, fps: float):
+        """소스 fps에서 버스트 범위(촬영 시각 앞뒤)를 모두 담을 수 있는 링 버퍼 크기를 정합니다.
+
+        링은 기록 중인 슬롯을 뺀 프레임만 고를 수 있으므로, 범위보다 작으면 앞쪽 프레임이 뒤쪽
+        프레임이 도착하기 전에 덮어써집니다. 필요한 크기가 ``MAX_HISTORY_FRAMES`` 를 넘으면
+        링에 담기는 만큼 범위를 줄입니다.
+
+        Returns:
+            (링 크기, 앞쪽 범위 초, 뒤쪽 범위 초)
+        """
+        window = cls.BURST_PRE_S + cls.BURST_POST_S
+        needed = math.ceil(fps * window) + cls.HISTORY_MARGIN_FRAMES
+        ring_size = min(max(needed, cls.CAPTURE_HISTORY_FRAMES), cls.MAX_HISTORY_FRAMES)
+        scale = min(1.0, (ring_size - cls.HISTORY_MARGIN_FRAMES) / (fps * window))
+        return ring_size, cls.BURST_PRE_S * scale, cls.BURST_POST_S * scale
 
     def update_countdown(self):
-        """Timer B callback: updates countdown every second."""
-        # 촬영 사이 카운트다운 중인 경우
-        if self.is_capture_countdown:
-            self.capture_countdown_remaining -= 1
-            if self.capture_countdown_remaining > 0:
-                # 큰 숫자로 카운트다운 표시
-                self.countdown_overlay.setText(str(self.capture_countdown_remaining))
-                self.countdown_overlay.show()
-                self.status_label.setText(f"Next capture in {self.capture_countdown_remaining}...")
+        """Timer B callback: 촬영 일정에 따라 카운트다운을 표시하고 마감 시각이 지난 사진을 촬영합니다.
+
+        타이머는 일정을 확인하는 역할만 하므로 틱이 늦어져도 이후 촬영 시각은 밀리지 않습니다.
+        """
+        schedule = self.capture_schedule
+        if schedule is None:
+            self.timer_countdown.stop()
+            return
+
+        now = time.monotonic()
+        # GUI 스레드가 오래 멈췄다면 지난 마감 시각을 모두 처리
+        while schedule.due(now):
+            deadline = schedule.next_deadline
+            wait_until = deadline + (self.burst_post_s if self.burst else 0.0)
+            if self.camera.latest_time < wait_until and now - wait_until < self.SHOT_GRACE_S:
+                # 마감 시각 이후 프레임이 곧 도착하므로 앞뒤 프레임을 모두 후보로 삼을 수 있게 대기
+                break
+            self.take_scheduled_shot(schedule, deadline, now)
+            if not self.timer_countdown.isActive():
+                # 촬영 실패로 중단됨
                 return
-            
-            # 촬영 사이 카운트다운 완료
-            self.countdown_overlay.hide()
-            self.is_capture_countdown = False
-            self.status_label.setText("Recording...")
-            self.trigger_flash()
-            self.capture_frame(auto=True)
-            
-            # 8장 미만이면 다음 촬영을 위해 카운트다운 시작
-            if len(self.captured_frames) < self.MAX_CAPTURES:
-                self.start_capture_countdown()
-            else:
-                # 8장 완료
-                self.timer_countdown.stop()
-                self.status_label.setText(f"Recording complete! ({self.MAX_CAPTURES} photos) - Select 3 photos")
-                self.start_button.setEnabled(True)
-                self.start_button.setText("Start Again")
-                self.selection_label.setText(f"Recording complete! Select 3 of {self.MAX_CAPTURES} photos (0/{self.SELECT_COUNT})")
+
+        if schedule.finished:
+            self.timer_countdown.stop()
+            self.capture_schedule = None
+            self.status_label.setText(f"Recording complete! ({self.MAX_CAPTURES} photos) - Select {self.SELECT_COUNT} photos")
+            self.start_button.setEnabled(True)
+            self.start_button.setText("Start Again")
+            self.selection_label.setText(f"Recording complete! Select {self.SELECT_COUNT} of {self.MAX_CAPTURES} photos (0/{self.SELECT_COUNT})")
+            self.preselect_best()
             return
-        
-        # 초기 카운트다운
-        self.countdown_remaining -= 1
-        if self.countdown_remaining > 0:
-            # 큰 숫자로 카운트다운 표시
-            self.countdown_overlay.setText(str(self.countdown_remaining))
-            self.countdown_overlay.show()
-            self.status_label.setText(f"Ready to record... {self.countdown_remaining}")
+
+        # 카운트다운 표시는 일정을 보여 주기만 함 (값이 바뀔 때만 갱신)
+        seconds = schedule.seconds_left(now)
+        if seconds <= 0 or seconds == self.countdown_shown:
             return
+        self.countdown_shown = seconds
+        self.countdown_overlay.setText(str(seconds))
+        self.countdown_overlay.show()
+        if schedule.taken == 0:
+            self.status_label.setText(f"Ready to record... {seconds}")
+        else:
+            self.status_label.setText(f"Next capture in {seconds}...")
 
-        # 초기 카운트다운 완료
-        self.countdown_overlay.hide()
-        self.timer_countdown.stop()
-        self.status_label.setText("Recording...")
-        self.trigger_flash()
-        self.capture_frame(auto=True)
-        
-        # 8장 미만이면 다음 촬영을 위해 카운트다운 시작
-        if len(self.captured_frames) < self.MAX_CAPTURES:
-            self.start_capture_countdown()
+    def take_scheduled_shot(self, schedule: CaptureSchedule, deadline: float, now: float):
+        """링 버퍼에서 마감 시각 부근의 프레임을 골라 촬영합니다.
+
+        버스트 모드에서는 마감 시각 앞뒤 프레임 중 가장 점수가 높은 프레임, 아니면
+        마감 시각에 가장 가까운 프레임을 사용합니다.
+        """
+        if self.burst:
+            _, frame_time, frame = self.pick_burst_frame(deadline - self.burst_pre_s, deadline + self.burst_post_s, deadline)
         else:
-            # 이미 8장이면 완료 처리
-            self.status_label.setText(f"Recording complete! ({self.MAX_CAPTURES} photos) - Select 3 photos")
+            _, frame_time, frame = self.camera.frame_near(deadline)
+        if frame is None:
+            self.timer_countdown.stop()
+            self.capture_schedule = None
+            self.countdown_overlay.hide()
+            self.status_label.setText("Capture failed: No frame")
             self.start_button.setEnabled(True)
             self.start_button.setText("Start Again")
-            self.selection_label.setText(f"Recording complete! Select 3 of {self.MAX_CAPTURES} photos (0/{self.SELECT_COUNT})")
-    
-    def start_capture_countdown(self):
-        """촬영 사이 카운트다운 시작."""
-        self.is_capture_countdown = True
-        self.capture_countdown_remaining = self.CAPTURE_INTERVAL_SECONDS
-        self.countdown_overlay.setText(str(self.capture_countdown_remaining))
-        self.countdown_overlay.show()
-        self.status_label.setText(f"Next capture in {self.capture_countdown_remaining}...")
-        self.timer_countdown.start(self.COUNTDOWN_INTERVAL_MS)
+            return
+
+        drift_ms = schedule.record_shot(frame_time)
+        self.metrics.observe("capture.drift", abs(drift_ms))
+        self.metrics.observe("capture.handling_delay", (now - deadline) * 1000)
+
+        self.countdown_overlay.hide()
+        self.countdown_shown = None
+        self.status_label.setText("Recording...")
+        self.trigger_flash()
+        self.capture_frame(auto=True, frame=frame)
 
+    def pick_burst_frame(self, start: float, end: float, target: float):
+        """``start`` ~ ``end`` 사이 링 프레임 중 선명도/노출 점수가 가장 높은 프레임을 복사해 반환합니다.
+
+        후보가 없거나 점수 계산 중 선택한 프레임이 덮어써지면 ``target`` 에 가장 가까운 프레임을 사용합니다.
+
+        Returns:
+            (시퀀스 번호, 도착 시각, 프레임 복사본)
+        """
+        candidates = self.camera.history(start, end)
+        if len(candidates) > 1:
+            with self.metrics.timer("capture.burst_score"):
+                best, _ = best_frame([frame for _, _, frame in candidates], self.check_blink)
+            seq, frame_time, _ = candidates[best]
+            frame = self.camera.copy_frame(seq)
+            if frame is not None:
+                self.metrics.count("capture.burst_frames", len(candidates))
+                return seq, frame_time, frame
+        return self.camera.frame_near(target)
 
     def trigger_flash(self):
         """Simple flash effect overlay on the preview."""
         self.flash_overlay.show()
         QTimer.singleShot(150, self.flash_overlay.hide)
 
-    def capture_frame(self, auto=False):
-        """Capture the current frame and add to the gallery."""
+    def capture_frame(self, auto=False, frame=None):
+        """Capture the current frame (or a frame picked by the schedule) and add to the gallery."""
         try:
-            if self.current_frame is None:
-                self.status_label.setText("Capture failed: No frame")
-                return
-
-            # 프레임을 안전하게 복사
-            frame = self.current_frame.copy()
+            if frame is None:
+                if self.current_frame is None:
+                    self.status_label.setText("Capture failed: No frame")
+                    return
+                if self.burst:
+                    # 버튼을 누르기 직전 프레임 중 가장 선명한 프레임
+                    now = time.monotonic()
+                    _, _, frame = self.pick_burst_frame(now - self.burst_pre_s, now, now)
+                else:
+                    # 링 버퍼의 최신 슬롯을 안전하게 복사
+                    _, frame = self.camera.latest(copy=True)
             if frame is None or frame.size == 0:
                 self.status_label.setText("Capture failed: Invalid frame")
                 return
 
+            if self.session is None:
+                self.start_session()
+            session = self.capture_session
             index = len(self.captured_frames) + 1
-            filename = self.output_dir / f"capture_{index:03d}.png"
-            
-            # 파일 저장 시도
-            success = cv2.imwrite(str(filename), frame)
-            if not success:
-                self.status_label.setText("Capture failed: File save error")
-                return
+            filename = self.session.capture_path(index, self.encoding.extension)
             
+            # 파일 저장은 백그라운드에서 (결과는 on_capture_saved로 통지)
+            # 저장이 끝나기 전에 다음 세션이 시작되어도 결과는 촬영한 세션의 매니페스트에 기록
+            self.session.expect_capture(filename)
+            self.capture_logs[filename] = self.session
+            self.capture_writer.submit(frame, filename)
             self.captured_frames.append(filename)
+            # 선택/합성에서 다시 읽지 않도록 메모리에 보관
+            session.frames.add(index, frame, filename)
+            with self.metrics.timer("capture.rank"):
+                session.ranker.add(index, frame)
+            with self.metrics.timer("capture.hash"):
+                self.capture_hashes[filename] = image_hashes(frame)
 
-            # Thumbnail for gallery - 안전한 메모리 처리
-            thumb_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            # numpy 배열을 복사하여 QImage가 안전하게 사용할 수 있도록 함
-            thumb_rgb_copy = thumb_rgb.copy()
-            h, w, ch = thumb_rgb_copy.shape
-            bytes_per_line = ch * w
-            
-            thumb_image = QImage(
-                thumb_rgb_copy.data,
-                w,
-                h,
-                bytes_per_line,
-                QImage.Format_RGB888,
-            )
-            
-            # QImage가 데이터를 소유하도록 복사본 생성 (메모리 안전성)
-            thumb_image = thumb_image.copy()
-            
-            # 그리드 위치 계산 (2열, 4행)
-            index = len(self.captured_frames) - 1  # 0부터 시작
-            row = index // 2  # 행 (0, 1, 2, 3)
-            col = index % 2   # 열 (0, 1)
+            # 그리드 위치 계산 (2열, 행 수는 촬영 장수에 따름)
+            position = index - 1  # 0부터 시작
+            row = position // 2  # 행 (0부터)
+            col = position % 2   # 열 (0, 1)
             
             # 썸네일 레이블 생성
             thumb_label = QLabel(self.gallery_grid_widget)  # 부모를 그리드 위젯으로 설정
+            session.adopt_label(thumb_label)  # 세션 종료 시 픽스맵과 함께 해제
             thumb_label.setAlignment(Qt.AlignCenter)
             # 이미지가 레이블 크기에 맞춰 확장 (그리드 셀을 완전히 채움)
             thumb_label.setScaledContents(True)
@@ -500,21 +595,9 @@ class PhotoBoothWindow(QMainWindow):
             thumb_label.setFixedSize(thumb_width, thumb_height)  # 4:3 비율 고정 크기
             # 레이블의 원본 크기 저장 (선택 시 크기 변경 방지)
             self.gallery_label_size[thumb_label] = (thumb_width, thumb_height)
-            thumb_label.setStyleSheet(
-                "QLabel { "
-                "border: 2px solid transparent; "
-                "background-color: #f0f0f0; "
-                "width: " + str(thumb_width) + "px; "
-                "height: " + str(thumb_height) + "px; "
-                "min-width: " + str(thumb_width) + "px; "
-                "max-width: " + str(thumb_width) + "px; "
-                "min-height: " + str(thumb_height) + "px; "
-                "max-height: " + str(thumb_height) + "px; "
-                "}"
-                "QLabel:hover { "
-                "border: 3px solid #2196F3; "
-                "}"
-            )
+            # 스타일은 전역 스타일시트에서 (선택 상태는 "selected" 속성으로 전환)
+            thumb_label.setObjectName("galleryThumb")
+            thumb_label.setProperty("selected", False)
             thumb_label.setCursor(Qt.PointingHandCursor)  # 클릭 가능 커서
             
             # 레이블 클릭 이벤트 연결 (클로저 문제 방지를 위해 기본 인자 사용)
@@ -522,8 +605,8 @@ class PhotoBoothWindow(QMainWindow):
                 return lambda event: self.on_gallery_label_clicked(label)
             thumb_label.mousePressEvent = make_click_handler(thumb_label)
             
-            # 파일 경로 매핑 저장
-            self.gallery_label_to_file[thumb_label] = filename
+            # 캡처 번호 매핑 저장
+            self.gallery_label_to_index[thumb_label] = index
             
             # 썸네일 생성 - 그리드 셀 크기에 맞게 스케일링
             # viewport 너비의 절반과 THUMBNAIL_HEIGHT를 기준으로 크기 계산
@@ -541,7 +624,7 @@ class PhotoBoothWindow(QMainWindow):
             thumb_target_height = self.THUMBNAIL_HEIGHT
             
             # 원본 이미지 크기
-            orig_height, orig_width = thumb_image.height(), thumb_image.width()
+            orig_height, orig_width = frame.shape[:2]
             
             # 비율 유지하면서 타겟 크기에 맞게 스케일링
             # 높이 기준으로 스케일링 (높이가 제한이므로)
@@ -552,21 +635,17 @@ class PhotoBoothWindow(QMainWindow):
             new_width = int(orig_width * scale)
             new_height = int(orig_height * scale)
             
-            # 썸네일 생성
-            thumb_pixmap = QPixmap.fromImage(thumb_image).scaled(
-                new_width, new_height,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation,
-            )
+            # 썸네일 생성 - 디스크를 기다리지 않고 메모리 프레임에서 생성
+            thumb_pixmap = session.frames.pixmap(index, new_width, new_height)
             
-            if thumb_pixmap.isNull():
+            if thumb_pixmap is None or thumb_pixmap.isNull():
                 print(f"Warning: Failed to create pixmap for {filename}")
                 return
             
             # 썸네일을 레이블에 설정
             thumb_label.setPixmap(thumb_pixmap)
             
-            # 그리드에 추가 (2열, 4행)
+            # 그리드에 추가 (2열)
             self.gallery_grid.addWidget(thumb_label, row, col)
             self.gallery_labels.append(thumb_label)
             
@@ -575,12 +654,7 @@ class PhotoBoothWindow(QMainWindow):
             
             # 그리드 레이아웃 업데이트
             self.gallery_grid_widget.updateGeometry()
-            
-            # 디버깅: 아이템이 추가되었는지 확인
-            print(f"Added item to gallery: {filename.name}, position: row={row}, col={col}, total items: {len(self.gallery_labels)}")
-            if len(self.gallery_labels) == 1:
-                # 첫 번째 썸네일 추가 시 그리드 너비 확인
-                QTimer.singleShot(200, lambda: print(f"Grid widget size: {self.gallery_grid_widget.width()}x{self.gallery_grid_widget.height()}, Scroll viewport: {self.gallery_scroll.viewport().width()}"))
+            self.metrics.count("gallery.items")
 
             if auto:
                 remaining = self.MAX_CAPTURES - len(self.captured_frames)
@@ -598,138 +672,160 @@ class PhotoBoothWindow(QMainWindow):
             print(f"Capture error: {e}")  # 디버깅용
 
     
+    def _load_capture(self, path):
+        """메모리에서 내려간 캡처를 디스크에서 다시 읽습니다 (저장 완료를 기다린 후)."""
+        self.capture_writer.flush([path])
+        return read_image(path)
+
+    @property
+    def session(self) -> Optional[SessionLog]:
+        """현재 세션의 디렉터리/매니페스트 (아직 시작하지 않았으면 None)."""
+        return self.capture_session.log
+
+    def start_session(self):
+        """이전 세션의 버퍼를 모두 해제하고 새 세션 디렉터리/매니페스트를 시작합니다."""
+        self.end_session()
+        self.capture_session = CaptureSession(self.session_store.create(self.template.name), loader=self._load_capture)
+
+    def end_session(self):
+        """현재 세션을 닫고 세션 버퍼와 이를 가리키는 UI 참조를 모두 해제합니다."""
+        for label in self.gallery_labels:
+            self.gallery_grid.removeWidget(label)
+        # 레이블 픽스맵, 프레임/썸네일/QPixmap 캐시, 점수, 합성 결과 해제
+        self.capture_session.close()
+        self.gallery_labels.clear()
+        self.gallery_label_to_index.clear()
+        self.gallery_label_size.clear()
+        self.selected_gallery_labels = []
+        self.captured_frames = []
+        self.selected_frames = []
+
+        self.finalize_button.setEnabled(False)
+        self.finalize_button.setText(f"Complete Selection (0/{self.SELECT_COUNT} Photos)")
+        set_style_state(self.finalize_button, "ready", False)
+        self.selection_label.setText(f"Select photos (0/{self.SELECT_COUNT})")
+        for i, label in enumerate(self.selected_preview_labels):
+            label.clear()
+            label.setText(f"Photo {i + 1}")
+
+    def memory_usage(self) -> Dict[str, int]:
+        """분류별 보유 바이트 수 (현재 세션 버퍼와 카메라 링 버퍼)."""
+        usage = self.capture_session.memory_usage()
+        usage["selected_previews"] = sum(pixmap_nbytes(label) for label in self.selected_preview_labels)
+        usage["camera_ring"] = self.camera.nbytes
+        return usage
+
+    def on_capture_saved(self, path, success):
+        """백그라운드 저장 완료 시 호출됩니다."""
+        path = Path(path)
+        log = self.capture_logs.pop(path, None)
+        if log is not None:
+            log.record_capture(path, success)
+        hashes = self.capture_hashes.pop(path, None)
+        if success and hashes is not None:
+            self.hash_index.add(path, hashes=hashes)
+        if not success:
+            if path in self.captured_frames:
+                # 디스크에 없는 사진은 자동 선택하지 않음 (결과 합성 전 저장 확인에서 실패하므로)
+                self.capture_session.ranker.discard(self.captured_frames.index(path) + 1)
+            self.status_label.setText(f"Capture failed: File save error ({Path(path).name})")
+
+    def schedule_gallery_relayout(self):
+        """갤러리 재배치를 예약합니다. 이미 예약되어 있으면 합쳐집니다."""
+        if not self.timer_relayout.isActive():
+            self.timer_relayout.start()
+
+    def update_grid_width(self):
+        """그리드 위젯 너비를 viewport 너비에 맞춥니다 (높이 동적 계산 포함)."""
+        viewport_width = self.gallery_scroll.viewport().width()
+        if viewport_width <= 0:
+            return
+
+        # 1. 여백 및 마진 값 가져오기
+        grid_spacing = self.gallery_grid.spacing() # 10px
+        # 좌우 마진 합계
+        grid_margin = (self.gallery_grid.contentsMargins().left() + 
+                       self.gallery_grid.contentsMargins().right())
+
+        # 2. 썸네일 너비 계산 (뷰포트 너비의 절반)
+        # 유효 너비 = 뷰포트 너비 - 좌우 마진 - 2개 열 사이 간격 1개
+        effective_content_width = viewport_width - grid_margin - grid_spacing
+        thumbnail_width = effective_content_width / 2
+
+        # 3. 썸네일 높이 계산 (최종 사진 비율 3:4 적용)
+        THUMBNAIL_ASPECT_RATIO = 3 / 4
+        new_thumbnail_height = int(thumbnail_width * THUMBNAIL_ASPECT_RATIO)
+
+        new_size = (int(thumbnail_width), new_thumbnail_height)
+        if new_size != self.gallery_thumbnail_size:
+            self.gallery_thumbnail_size = new_size
+
+            # 4. 갤러리 그리드 행 높이 업데이트 (2열 기준 행 수는 촬영 장수에 따름)
+            rows = (self.MAX_CAPTURES + 1) // 2
+            for i in range(rows):
+                self.gallery_grid.setRowMinimumHeight(i, new_thumbnail_height)
+            
+            # 5. 갤러리 위젯의 고정 높이 업데이트
+            # 높이 = (행 수 * 높이) + (행 사이 간격) + (상하 마진)
+            grid_height = rows * new_thumbnail_height + ((rows - 1) * grid_spacing)+ (self.gallery_grid.contentsMargins().top() + self.gallery_grid.contentsMargins().bottom())
+            self.gallery_grid_widget.setMinimumHeight(grid_height)
+            self.gallery_grid_widget.setMaximumHeight(grid_height)
+
+            # 6. 그리드 위젯의 최대 너비를 설정
+            self.gallery_grid_widget.setMaximumWidth(viewport_width)
+            self.gallery_grid_widget.updateGeometry()
+
+        # 7. 크기가 다른 썸네일만 다시 맞춤 (크기가 같으면 아무 작업도 하지 않음)
+        self.update_thumbnails_size(new_thumbnail_height, int(thumbnail_width))
+
     def update_thumbnails_size(self, new_height, new_width):
         """
-        갤러리 그리드 내의 모든 썸네일 위젯의 높이와 너비를 조정하고 이미지를 리스케일링합니다.
+        갤러리 그리드 내 썸네일 중 크기가 다른 위젯만 높이와 너비를 조정하고 이미지를 리스케일링합니다.
+        이미지는 캡처별 썸네일 피라미드에서 가장 가까운 단계를 골라 만듭니다.
         """
-        
-        # 예시: QGridLayout을 순회하며 위젯 크기 조정
-        for i in range(self.gallery_grid.count()):
-            item = self.gallery_grid.itemAt(i)
-            if item and item.widget():
-                thumbnail_widget = item.widget() # 썸네일 위젯 (QLabel 등으로 가정)
-                
-                # 1. 썸네일 위젯의 높이를 설정합니다.
-                thumbnail_widget.setFixedHeight(new_width,new_height) 
-                
-                # 2. 썸네일 위젯에 표시되는 이미지를 새 크기에 맞게 다시 스케일링합니다.
-                # 이 로직은 썸네일 위젯이 원본 QPixmap을 저장하고 있을 때 작동합니다.
-                if hasattr(thumbnail_widget, 'original_pixmap') and thumbnail_widget.original_pixmap is not None:
-                    scaled_pixmap = thumbnail_widget.original_pixmap.scaled(
-                        new_width,new_height, 
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    thumbnail_widget.setPixmap(scaled_pixmap)
-                
-                thumbnail_widget.update() # 위젯 강제 업데이트
+        for thumbnail_widget in self.gallery_labels:
+            if self.gallery_label_size.get(thumbnail_widget) == (new_width, new_height):
+                continue
+
+            # 1. 썸네일 위젯 크기 설정 (선택 토글 시에도 이 크기를 유지)
+            thumbnail_widget.setFixedSize(new_width, new_height)
+            self.gallery_label_size[thumbnail_widget] = (new_width, new_height)
+
+            # 2. 새 크기에 맞는 썸네일 (피라미드 단계에서 최종 축소만 수행, 크기별 캐시)
+            index = self.gallery_label_to_index.get(thumbnail_widget)
+            if index is not None and index in self.capture_session.frames:
+                pixmap = self.capture_session.frames.pixmap(index, new_width, new_height)
+                if pixmap is not None:
+                    thumbnail_widget.setPixmap(pixmap)
+
     # ---- Selection handlers -------------------------------------------------------
 
     def on_gallery_label_clicked(self, label):
         """갤러리 레이블 클릭 시 호출되는 핸들러."""
         # 레이블에서 파일 경로 가져오기
-        if label not in self.gallery_label_to_file:
+        if label not in self.gallery_label_to_index:
             return
         
-        # 이미 선택된 레이블인지 확인
+        # 이미 선택된 레이블인지 확인 - 선택 상태 전환은 속성 변경과 다시 그리기만 수행
+        # (크기는 setFixedSize로 고정되어 있으므로 스타일 전환으로 바뀌지 않음)
         if label in self.selected_gallery_labels:
-            # 선택 해제 - 스타일만 변경, 크기는 변경하지 않음
+            # 선택 해제
             self.selected_gallery_labels.remove(label)
-            # 저장된 원본 크기 사용 (크기 변경 방지)
-            if label in self.gallery_label_size:
-                original_width, original_height = self.gallery_label_size[label]
-            else:
-                # 저장된 크기가 없으면 현재 크기 사용
-                original_width = label.width()
-                original_height = label.height()
-                self.gallery_label_size[label] = (original_width, original_height)
-            # 크기를 강제로 고정 (크기 변경 완전 방지)
-            label.setFixedSize(original_width, original_height)
-            # 크기 정책은 이미 Fixed로 설정되어 있으므로 변경하지 않음
-            # 스타일만 변경하되 크기 속성도 포함 (크기 변경 방지)
-            label.setStyleSheet(
-                "QLabel { "
-                "border: 2px solid transparent; "
-                "background-color: #f0f0f0; "
-                "width: " + str(original_width) + "px; "
-                "height: " + str(original_height) + "px; "
-                "min-width: " + str(original_width) + "px; "
-                "max-width: " + str(original_width) + "px; "
-                "min-height: " + str(original_height) + "px; "
-                "max-height: " + str(original_height) + "px; "
-                "}"
-                "QLabel:hover { "
-                "border: 3px solid #2196F3; "
-                "}"
-            )
+            set_style_state(label, "selected", False)
         else:
-            # 선택 추가 (최대 3장까지만)
+            # 선택 추가 (최대 SELECT_COUNT장까지만)
             if len(self.selected_gallery_labels) >= self.SELECT_COUNT:
-                # 가장 오래된 선택 해제 - 스타일만 변경, 크기는 변경하지 않음
+                # 가장 오래된 선택 해제
                 oldest_label = self.selected_gallery_labels.pop(0)
-                # 저장된 원본 크기 사용 (크기 변경 방지)
-                if oldest_label in self.gallery_label_size:
-                    old_width, old_height = self.gallery_label_size[oldest_label]
-                else:
-                    # 저장된 크기가 없으면 현재 크기 사용
-                    old_width = oldest_label.width()
-                    old_height = oldest_label.height()
-                    self.gallery_label_size[oldest_label] = (old_width, old_height)
-                # 크기를 강제로 고정 (크기 변경 완전 방지)
-                oldest_label.setFixedSize(old_width, old_height)
-                # 크기 정책은 이미 Fixed로 설정되어 있으므로 변경하지 않음
-                # 스타일만 변경하되 크기 속성도 포함 (크기 변경 방지)
-                oldest_label.setStyleSheet(
-                    "QLabel { "
-                    "border: 2px solid transparent; "
-                    "background-color: #f0f0f0; "
-                    "width: " + str(old_width) + "px; "
-                    "height: " + str(old_height) + "px; "
-                    "min-width: " + str(old_width) + "px; "
-                    "max-width: " + str(old_width) + "px; "
-                    "min-height: " + str(old_height) + "px; "
-                    "max-height: " + str(old_height) + "px; "
-                    "}"
-                    "QLabel:hover { "
-                    "border: 3px solid #2196F3; "
-                    "}"
-                )
+                set_style_state(oldest_label, "selected", False)
             
-            # 새 레이블 선택 - 스타일만 변경, 크기는 변경하지 않음
+            # 새 레이블 선택
             self.selected_gallery_labels.append(label)
-            # 저장된 원본 크기 사용 (크기 변경 방지)
-            if label in self.gallery_label_size:
-                original_width, original_height = self.gallery_label_size[label]
-            else:
-                # 저장된 크기가 없으면 현재 크기 사용
-                original_width = label.width()
-                original_height = label.height()
-                self.gallery_label_size[label] = (original_width, original_height)
-            # 크기를 강제로 고정 (크기 변경 완전 방지)
-            label.setFixedSize(original_width, original_height)
-            # 크기 정책은 이미 Fixed로 설정되어 있으므로 변경하지 않음
-            # 스타일만 변경하되 크기 속성도 포함 (크기 변경 방지)
-            # 선택 시 테두리 색깔만 변경 (border 크기는 2px로 유지하여 크기 변경 방지)
-            # 모든 상태에서 테두리 색상이 명확하게 변경되도록 설정
-            label.setStyleSheet(
-                "QLabel { "
-                "border: 2px solid #4CAF50; "
-                "background-color: rgba(76, 175, 80, 0.1); "
-                "width: " + str(original_width) + "px; "
-                "height: " + str(original_height) + "px; "
-                "min-width: " + str(original_width) + "px; "
-                "max-width: " + str(original_width) + "px; "
-                "min-height: " + str(original_height) + "px; "
-                "max-height: " + str(original_height) + "px; "
-                "}"
-                "QLabel:hover { "
-                "border: 2px solid #66BB6A; "
-                "background-color: rgba(76, 175, 80, 0.25); "
-                "}"
-            )
+            set_style_state(label, "selected", True)
         
         # 선택된 파일 경로 업데이트
-        self.selected_frames = [self.gallery_label_to_file[label] for label in self.selected_gallery_labels]
+        selected_indices = [self.gallery_label_to_index[label] for label in self.selected_gallery_labels]
+        self.selected_frames = [self.capture_session.frames.path(index) for index in selected_indices]
         selected_count = len(self.selected_gallery_labels)
         
         # 선택 상태 업데이트
@@ -738,106 +834,164 @@ class PhotoBoothWindow(QMainWindow):
         # 선택된 사진을 미리보기 영역에 표시
         for i, preview_label in enumerate(self.selected_preview_labels):
             if i < selected_count:
-                # 선택된 사진 로드 및 표시
-                img_path = self.selected_frames[i]
-                if img_path.exists():
-                    try:
-                        pixmap = QPixmap(str(img_path))
-                        if not pixmap.isNull():
-                            # 레이블 크기에 맞춰 스케일링
-                            scaled = pixmap.scaled(
-                                preview_label.width(),
-                                preview_label.height(),
-                                Qt.KeepAspectRatio,
-                                Qt.SmoothTransformation,
-                            )
-                            preview_label.setPixmap(scaled)
-                            preview_label.setText("")
-                        else:
-                            preview_label.setText(f"Photo {i+1}\n(Invalid image)")
-                    except Exception as e:
-                        preview_label.setText(f"Photo {i+1}\n(Error)")
-                        print(f"미리보기 로드 오류: {e}")
-                else:
-                    preview_label.setText(f"Photo {i+1}\n(Not found)")
+                # 선택된 사진 표시 - 메모리 프레임에서 레이블 크기로 만든 QPixmap (캐시됨)
+                try:
+                    pixmap = self.capture_session.frames.pixmap(
+                        selected_indices[i],
+                        preview_label.width(),
+                        preview_label.height(),
+                    )
+                    if pixmap is not None and not pixmap.isNull():
+                        preview_label.setPixmap(pixmap)
+                        preview_label.setText("")
+                    else:
+                        preview_label.setText(f"Photo {i+1}\n(Invalid image)")
+                except Exception as e:
+                    preview_label.setText(f"Photo {i+1}\n(Error)")
+                    print(f"미리보기 로드 오류: {e}")
             else:
                 # 빈 슬롯
                 preview_label.clear()
                 preview_label.setText(f"Photo {i+1}")
         
-        # 3장이 선택되면 완료 버튼 활성화
+        # 모두 선택되면 완료 버튼 활성화
         if selected_count == self.SELECT_COUNT:
             self.finalize_button.setEnabled(True)
             self.finalize_button.setText("✓ Complete Selection - View Final Result!")
-            self.finalize_button.setStyleSheet(
-                "padding: 15px 30px; "
-                "font-size: 18px; "
-                "font-weight: bold; "
-                "background-color: #4CAF50; "
-                "color: white; "
-                "border-radius: 5px;"
-            )
+            set_style_state(self.finalize_button, "ready", True)
             self.selection_label.setText(f"✓ {self.SELECT_COUNT} photos selected! Click button below to view result")
         else:
             self.finalize_button.setEnabled(False)
             self.finalize_button.setText(f"Complete Selection ({selected_count}/{self.SELECT_COUNT} Photos)")
-            self.finalize_button.setStyleSheet(
-                "padding: 15px 30px; "
-                "font-size: 18px; "
-                "font-weight: bold; "
-                "background-color: #9E9E9E; "
-                "color: white; "
-                "border-radius: 5px;"
-            )
+            set_style_state(self.finalize_button, "ready", False)
+
+    def preselect_best(self):
+        """순위기가 고른 상위 사진을 촬영 순서대로 미리 선택합니다 (사용자는 확인하거나 바꿀 수 있음)."""
+        picks = sorted(self.capture_session.ranker.rank(self.SELECT_COUNT))
+        if len(picks) < self.SELECT_COUNT:
+            return
+        index_to_label = {index: label for label, index in self.gallery_label_to_index.items()}
+        for label in list(self.selected_gallery_labels):
+            self.on_gallery_label_clicked(label)  # 기존 선택 해제
+        for index in picks:
+            label = index_to_label.get(index)
+            if label is not None:
+                self.on_gallery_label_clicked(label)
+        self.status_label.setText(f"Recording complete! Best {self.SELECT_COUNT} photos pre-selected - confirm or change")
 
     def finalize_selection(self):
         """선택 완료 버튼 클릭 시 호출되는 핸들러."""
         if len(self.selected_frames) != self.SELECT_COUNT:
-            self.status_label.setText("Please select 3 photos")
+            self.status_label.setText(f"Please select {self.SELECT_COUNT} photos")
             return
         
-        # 선택된 3장의 파일 경로 출력
+        # 선택된 사진들이 디스크에 모두 저장될 때까지 대기
+        if not self.capture_writer.flush(self.selected_frames):
+            self.status_label.setText("Capture failed: File save error")
+            return
+
+        # 선택된 사진의 파일 경로 출력
         self.status_label.setText("Processing...")
         print(f"Selected {self.SELECT_COUNT} photos:")
         for i, path in enumerate(self.selected_frames, 1):
             print(f"  {i}. {path}")
         
-        # 최종 결과 화면 열기
-        result_dialog = FinalResultDialog(self.selected_frames, self.output_dir, self)
-        result_dialog.exec_()
-        
+        self.open_result_dialog().exec_()
+        # 다이얼로그를 닫으면 합성 결과를 해제 (창의 자식으로 남아 세션마다 쌓이지 않도록, 진행 중인
+        # 합성/내보내기가 있으면 GUI를 멈추지 않고 완료 후 해제)
+        self.capture_session.release_result()
+
         self.status_label.setText("Final selection complete!")
 
+    def open_result_dialog(self) -> "FinalResultDialog":
+        """선택한 사진으로 최종 결과 다이얼로그를 만들고 현재 세션에 등록합니다."""
+        # 최종 결과 화면 열기 - 합성은 메모리에 있는 프레임으로
+        session = self.capture_session
+        images = [session.frames.get(self.gallery_label_to_index[label]) for label in self.selected_gallery_labels]
+        log = session.log
+        log.record_selection(self.selected_frames)
+        result_dialog = FinalResultDialog(self.selected_frames, log.directory, self, self.encoding, images, self.template)
+        result_dialog.result_saved.connect(lambda path: log.record_result(Path(path), self.template.name))
+        result_dialog.result_saved.connect(lambda path: self.hash_index.add(Path(path), image=result_dialog.combined_image))
+        session.adopt_result(result_dialog)
+        return result_dialog
+
     # ---- Qt lifecycle -------------------------------------------------------------
 
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize:
+            if obj is self.preview_label:
+                size = event.size()
+                self.preview_renderer.set_target_size(size)
+                self.flash_overlay.resize(size)
+                self.countdown_overlay.resize(size)
+            elif obj is self.gallery_scroll.viewport():
+                self.schedule_gallery_relayout()
+        return super().eventFilter(obj, event)
+
     def resizeEvent(self, event):
         """창 크기가 변경될 때 호출됩니다."""
         super().resizeEvent(event)
-        # 그리드 너비 업데이트 (창 크기 변경 시)
-        if hasattr(self, '_update_grid_width_func'):
-            # 약간의 지연을 두어 레이아웃이 완전히 업데이트된 후 실행
-            QTimer.singleShot(50, self._update_grid_width_func)
+        # 그리드 너비 업데이트 (창 크기 변경 시) - 연속된 이벤트는 한 번의 재배치로 합쳐짐
+        if hasattr(self, 'timer_relayout'):
+            self.schedule_gallery_relayout()
 
     def closeEvent(self, event):
         if self.timer_stream.isActive():
             self.timer_stream.stop()
         if self.timer_countdown.isActive():
             self.timer_countdown.stop()
+        self.timer_metrics_overlay.stop()
+        self.timer_metrics_dump.stop()
 
-        if self.capture.isOpened():
-            self.capture.release()
-        cv2.destroyAllWindows()
+        self.camera.stop()
+        self.capture_writer.shutdown()
+        # 닫힌 뒤 해제를 기다리는 결과 다이얼로그를 포함해 진행 중인 합성/내보내기를 끝까지 저장
+        for dialog in self.findChildren(FinalResultDialog):
+            dialog.wait()
+        # 대기열에 남은 저장 완료 통지를 처리해 세션 매니페스트를 마무리
+        QApplication.sendPostedEvents(None, QEvent.MetaCall)
+        if self.metrics_path is not None:
+            # 대기 중이던 캡처 저장까지 반영한 최종 지표
+            self.dump_metrics()
+        self.capture_session.close()
+        try:
+            cv2.destroyAllWindows()
+        except cv2.error:
+            # headless OpenCV 빌드에는 HighGUI 창 지원이 없음
+            pass
         super().closeEvent(event)
 
 
 class FinalResultDialog(QDialog):
     """최종 결과를 표시하고 다운로드할 수 있는 다이얼로그."""
     
-    def __init__(self, selected_frames: List[Path], output_dir: Path, parent=None):
+    result_saved = pyqtSignal(str)  # 결과 파일이 디스크에 확정되면 경로와 함께 발생
+    
+    def __init__(
+        self,
+        selected_frames: List[Path],
+        output_dir: Path,
+        parent=None,
+        encoding: EncodeSettings = None,
+        images: List[np.ndarray] = None,
+        template: LayoutTemplate = None,
+    ):
         super().__init__(parent)
         self.selected_frames = selected_frames
+        self.images = images  # 메모리에 있는 선택 프레임 (없으면 파일에서 읽음)
         self.output_dir = output_dir
+        self.encoding = encoding or EncodeSettings()
+        self.template = template or load_template()
         self.combined_image_path = None
+        self.composer = None  # 백그라운드 합성 작업자
+        self.combined_image = None  # 메모리에 있는 원본 해상도 합성 결과 (다른 형식으로 내보낼 때 사용)
+        self.exporter = Exporter()
+        self.exporter.finished.connect(self.on_export_finished)
+        # 작업 상태는 완료 시그널로 갱신 (시그널 처리 시점에 스레드가 아직 살아 있을 수 있음)
+        self.composing = False
+        self.exporting = False
+        self.releasing = False  # 닫힌 뒤 작업이 끝나기를 기다리는 중
         
         self.setWindowTitle("Final Result - 3-Cut Photo Booth")
         self.resize(1000, 700)
@@ -850,7 +1004,7 @@ class FinalResultDialog(QDialog):
         layout = QVBoxLayout(self)
         
         # 제목
-        title_label = QLabel("Your 3-Cut Photo", self)
+        title_label = QLabel(f"Your {self.template.display_name} Photo", self)
         title_label.setAlignment(Qt.AlignCenter)
         title_label.setStyleSheet("font-size: 24px; font-weight: bold; padding: 20px;")
         layout.addWidget(title_label)
@@ -893,66 +1047,202 @@ class FinalResultDialog(QDialog):
         layout.addLayout(button_layout)
     
     def create_combined_image(self):
-        """3장의 이미지를 합성합니다."""
-        try:
-            # 출력 파일 경로 생성
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.combined_image_path = self.output_dir / f"final_result_{timestamp}.png"
-            
-            # 이미지 합성
-            success = combine_three_images(
-                self.selected_frames,
-                self.combined_image_path,
-                layout="vertical"
-            )
-            
-            if success and self.combined_image_path.exists():
-                # 합성된 이미지 표시
-                pixmap = QPixmap(str(self.combined_image_path))
-                scaled = pixmap.scaled(
-                    self.result_label.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation,
-                )
-                self.result_label.setPixmap(scaled)
-                self.result_label.setText("")
-                self.download_button.setEnabled(True)
-            else:
-                self.result_label.setText("Failed to create combined image")
-        
-        except Exception as e:
-            self.result_label.setText(f"Error: {str(e)}")
-            print(f"이미지 합성 오류: {e}")
+        """선택한 사진들의 합성을 백그라운드에서 시작합니다.
+
+        저해상도 미리보기가 먼저 표시되고, 원본 해상도 결과가 디스크에 확정되면
+        다운로드 버튼이 활성화됩니다.
+        """
+        # 출력 파일 경로 생성 (세션 디렉터리)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.combined_image_path = self.output_dir / f"final_result_{timestamp}{self.encoding.extension}"
+
+        self.composer = ResultComposer(self.template, self.encoding)
+        self.composer.preview_ready.connect(self.on_preview_ready)
+        self.composer.composed.connect(self.on_result_composed)
+        self.composer.finished.connect(self.on_result_finished)
+        self.composing = True
+        target = self.result_label.size().expandedTo(self.result_label.minimumSize())
+        self.composer.start(
+            self.images or self.selected_frames,
+            self.combined_image_path,
+            preview_size=(target.width(), target.height()),
+        )
+
+    def on_preview_ready(self, preview: np.ndarray):
+        """저해상도 합성 결과를 바로 표시합니다 (파일을 다시 읽지 않음)."""
+        pixmap = ndarray_to_pixmap(preview)
+        if pixmap.width() > self.result_label.width() or pixmap.height() > self.result_label.height():
+            pixmap = pixmap.scaled(self.result_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.result_label.setPixmap(pixmap)
+        self.result_label.setText("")
+
+    def on_result_composed(self, image: np.ndarray):
+        self.combined_image = image
+
+    @property
+    def nbytes(self) -> int:
+        """보유한 합성 결과와 미리보기 픽스맵의 바이트 수."""
+        nbytes = self.combined_image.nbytes if self.combined_image is not None else 0
+        return nbytes + pixmap_nbytes(self.result_label)
+
+    def release(self):
+        """결과 이미지를 해제하고 다이얼로그를 삭제합니다.
+
+        합성이나 내보내기(USB 복사 등)가 아직 진행 중이면 GUI 스레드에서 기다리지 않고,
+        미리보기만 바로 비운 뒤 작업 완료 시그널을 받았을 때 나머지를 해제합니다.
+        """
+        if self.releasing:
+            return
+        self.releasing = True
+        self.images = None
+        self.result_label.clear()
+        self._release_if_idle()
+
+    def _release_if_idle(self):
+        if not self.releasing or self.composing or self.exporting:
+            return
+        self.combined_image = None
+        self.deleteLater()
+
+    def wait(self):
+        """합성/내보내기 작업이 끝날 때까지 기다립니다 (앱 종료 시에만 사용)."""
+        if self.composer is not None:
+            self.composer.wait()
+        self.exporter.wait()
+
+    def on_result_finished(self, path: str, success: bool):
+        """결과 파일이 디스크에 확정되면 다운로드를 허용합니다."""
+        self.composing = False
+        if success:
+            self.download_button.setEnabled(True)
+            self.result_saved.emit(path)
+        elif not self.releasing:
+            self.result_label.clear()
+            self.result_label.setText("Failed to create combined image")
+        self._release_if_idle()
     
     def download_image(self):
-        """이미지를 다운로드합니다."""
+        """이미지를 다운로드합니다 (백그라운드에서 내보내기)."""
         if self.combined_image_path is None or not self.combined_image_path.exists():
             return
+        if self.exporter.busy:
+            return
         
-        # 파일 다이얼로그 열기
-        default_filename = f"3cut_photo_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        file_path, _ = QFileDialog.getSaveFileName(
+        # 파일 다이얼로그 열기 - 현재 형식이 기본, 다른 형식은 메모리의 합성 결과를 바로 인코딩
+        extension = self.combined_image_path.suffix
+        default_filename = f"{self.template.name}_photo_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
+        formats = [self.encoding.format] + [f for f in EXPORT_FORMATS if f != self.encoding.format]
+        filters = [f"{f.upper()} Images (*{EncodeSettings(f).extension})" for f in formats]
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Save Image",
             str(Path.home() / "Downloads" / default_filename),
-            "PNG Images (*.png);;All Files (*)"
+            ";;".join(filters + ["All Files (*)"]),
         )
         
         if file_path:
-            try:
-                # 파일 복사
-                import shutil
-                shutil.copy2(self.combined_image_path, file_path)
-                self.result_label.setText(f"Image saved to:\n{file_path}")
-            except Exception as e:
-                self.result_label.setText(f"Failed to save image: {str(e)}")
-                print(f"파일 저장 오류: {e}")
+            path = Path(file_path)
+            chosen = format_for_path(path)
+            if chosen is None:
+                # 확장자가 없으면 선택한 필터의 형식으로 저장
+                chosen = formats[filters.index(selected_filter)] if selected_filter in filters else self.encoding.format
+                path = path.with_name(path.name + EncodeSettings(chosen).extension)
+            # 같은 형식이면 파일을 그대로 내보내고(링크/커널 복사), 다르면 기존 품질 설정으로 인코딩
+            encoding = None if chosen == self.encoding.format else EncodeSettings(chosen, quality=self.encoding.quality)
+            self.download_button.setEnabled(False)
+            self.result_label.setText(f"Saving to:\n{path}")
+            self.exporting = True
+            self.exporter.export(path, self.combined_image_path, self.combined_image, encoding)
+
+    def on_export_finished(self, path: str, success: bool, detail: str):
+        self.exporting = False
+        if self.releasing:
+            # 이미 닫힌 다이얼로그 - 화면은 갱신하지 않고 해제만
+            self._release_if_idle()
+            return
+        self.download_button.setEnabled(True)
+        if success:
+            self.result_label.setText(f"Image saved to:\n{path}")
+        else:
+            self.result_label.setText(f"Failed to save image: {detail}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="3-Cut Photo Booth")
+    parser.add_argument(
+        "--source",
+        default=None,
+        help="frame source: webcam[:N], video:<file>, images:<dir>, pattern[:WxH[@FPS]] "
+             "(default: $PHOTOBOOTH_SOURCE or webcam)",
+    )
+    parser.add_argument(
+        "--template",
+        default=None,
+        help="result layout: 3cut, 3cut-horizontal, 4cut, 2x2 or a template .json file "
+             "(default: $PHOTOBOOTH_TEMPLATE or 3cut)",
+    )
+    parser.add_argument(
+        "--capture-format",
+        default="png",
+        help="capture/result encoding: png[:LEVEL], jpeg[:QUALITY], webp[:QUALITY], npy (default: png)",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        default=os.environ.get(METRICS_ENV_VAR),
+        help="periodically dump timing metrics to this .json (latest snapshot) or .csv (appended) file "
+             "(default: $PHOTOBOOTH_METRICS)",
+    )
+    parser.add_argument(
+        "--metrics-overlay",
+        action="store_true",
+        help="show preview FPS and stage timings on top of the live preview",
+    )
+    parser.add_argument(
+        "--soak",
+        type=int,
+        default=0,
+        metavar="N",
+        help="run N simulated sessions against a synthetic source (default source: pattern) "
+             "and fail if RSS keeps growing",
+    )
+    parser.add_argument(
+        "--no-burst",
+        action="store_true",
+        help="save the frame nearest to each shot time instead of the sharpest frame around it",
+    )
+    parser.add_argument(
+        "--blink-check",
+        action="store_true",
+        help="penalise burst frames with closed eyes (needs OpenCV Haar cascades)",
+    )
+    # 나머지 인자는 Qt에 그대로 전달
+    return parser.parse_known_args(argv[1:])
 
 
 def main():
-    app = QApplication(sys.argv)
-    window = PhotoBoothWindow()
+    args, qt_args = parse_args(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
+    soak_root = tempfile.mkdtemp(prefix="photobooth_soak_") if args.soak else None
+    window = PhotoBoothWindow(
+        open_frame_source(args.source or ("pattern" if args.soak else None)),
+        EncodeSettings.from_spec(args.capture_format),
+        load_template(args.template),
+        metrics_path=args.metrics,
+        metrics_overlay=args.metrics_overlay,
+        burst=not args.no_burst,
+        check_blink=args.blink_check,
+        captures_root=Path(soak_root) if soak_root else None,
+    )
     window.show()
+    if args.soak:
+        # 촬영 결과는 임시 저장소에 만들고 끝나면 지움
+        try:
+            code = run_soak(window, args.soak)
+        finally:
+            window.close()
+            shutil.rmtree(soak_root, ignore_errors=True)
+        sys.exit(code)
     sys.exit(app.exec_())
 
 
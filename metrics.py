@@ -0,0 +1,225 @@
+"""Lightweight runtime metrics.
+
+카메라 읽기, 색 변환, 미리보기 축소, 캡처 인코딩, 썸네일 생성, 합성 등 단계별 소요 시간을
+고정 버킷 히스토그램으로 모으고, 미리보기 FPS, 늦은 타이머 틱, 버려진 프레임 수를 셉니다.
+느린 키오스크가 카메라/CPU/디스크 중 어디에 막혀 있는지 확인하는 용도이며, 화면 오버레이
+(``summary()``)와 주기적인 JSON/CSV 덤프(``dump()``)로 확인합니다.
+
+기록 비용은 타이머 한 번과 잠금 한 번 정도이므로 캡처 스레드에서도 사용할 수 있습니다.
+"""
+import bisect
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+METRICS_ENV_VAR = "PHOTOBOOTH_METRICS"  # 덤프 파일 경로 (.json 또는 .csv)
+
+# 0.05 ms ~ 약 20 s 범위의 로그 간격 버킷 경계 (ms)
+BUCKET_BOUNDS_MS: List[float] = [0.05 * 1.25 ** i for i in range(58)]
+
+
+def current_rss() -> int:
+    """현재 프로세스의 상주 메모리(RSS) 바이트 수.
+
+    Linux는 ``/proc/self/statm`` 의 현재 값을, 그 밖의 플랫폼은 최대 RSS를 반환합니다.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Histogram:
+    """고정 버킷 지연 시간 히스토그램 (백분위수는 버킷 안에서 선형 보간한 근삿값)."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+
+    def percentile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKET_BOUNDS_MS[i - 1] if i > 0 else 0.0
+                upper = BUCKET_BOUNDS_MS[i] if i < len(BUCKET_BOUNDS_MS) else self.max
+                value = lower + (upper - lower) * (rank - seen) / n
+                return min(max(value, self.min), self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max,
+        }
+
+
+class Metrics:
+    """이름별 히스토그램, 카운터, 게이지(최근 값), 이벤트 빈도(FPS) 저장소."""
+
+    RATE_WINDOW = 120  # FPS 계산에 사용할 최근 이벤트 수
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._ticks: Dict[str, Deque[float]] = {}
+        self.started = time.monotonic()
+
+    def observe(self, name: str, ms: float):
+        """소요 시간(ms)을 기록합니다."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    @contextmanager
+    def timer(self, name: str):
+        """``with`` 블록의 소요 시간을 기록합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float):
+        """현재 값을 기록합니다 (메모리 사용량처럼 누적이 아닌 값)."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def tick(self, name: str):
+        """이벤트 발생을 기록합니다 (``rate()`` 로 초당 빈도 조회)."""
+        now = time.monotonic()
+        with self._lock:
+            ticks = self._ticks.get(name)
+            if ticks is None:
+                ticks = self._ticks[name] = deque(maxlen=self.RATE_WINDOW)
+            ticks.append(now)
+
+    def rate(self, name: str) -> float:
+        """최근 이벤트 기준 초당 빈도 (마지막 이벤트가 1초 넘게 없으면 0)."""
+        with self._lock:
+            ticks = self._ticks.get(name)
+            if not ticks or len(ticks) < 2 or time.monotonic() - ticks[-1] > 1.0:
+                return 0.0
+            return (len(ticks) - 1) / (ticks[-1] - ticks[0])
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def histogram(self, name: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.summary() if histogram is not None else None
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._ticks.clear()
+            self.started = time.monotonic()
+
+    def snapshot(self) -> Dict:
+        """모든 지표를 JSON으로 직렬화할 수 있는 딕셔너리로 반환합니다."""
+        with self._lock:
+            histograms = {name: h.summary() for name, h in sorted(self._histograms.items())}
+            counters = dict(sorted(self._counters.items()))
+            gauges = dict(sorted(self._gauges.items()))
+            rate_names = sorted(self._ticks)
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "uptime_s": time.monotonic() - self.started,
+            "rates": {name: self.rate(name) for name in rate_names},
+            "counters": counters,
+            "gauges": gauges,
+            "timings": histograms,
+        }
+
+    def summary(self, timings: List[str]) -> str:
+        """화면 오버레이용 짧은 요약 (FPS, 주요 단계 p50, 카운터)."""
+        lines = [f"preview {self.rate('preview.frames'):.1f} fps / camera {self.rate('camera.frames'):.1f} fps"]
+        for name in timings:
+            h = self.histogram(name)
+            if h is not None:
+                lines.append(f"{name:18s} p50 {h['p50_ms']:6.1f}  p90 {h['p90_ms']:6.1f} ms")
+        with self._lock:
+            counters = dict(self._counters)
+        if counters:
+            lines.append("  ".join(f"{name} {value}" for name, value in sorted(counters.items())))
+        return "\n".join(lines)
+
+    def dump(self, path: Path):
+        """지표를 파일로 저장합니다.
+
+        ``.json`` 은 최신 스냅숏으로 원자적으로 교체하고, ``.csv`` 는 호출할 때마다 지표별
+        한 줄씩 추가합니다 (시계열 분석용).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        snapshot = self.snapshot()
+        if path.suffix.lower() == ".csv":
+            new_file = not path.exists()
+            with open(path, "a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(["timestamp", "kind", "name", "value", "count", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"])
+                ts = snapshot["timestamp"]
+                for name, value in snapshot["rates"].items():
+                    writer.writerow([ts, "rate", name, f"{value:.2f}", "", "", "", "", "", ""])
+                for name, value in snapshot["counters"].items():
+                    writer.writerow([ts, "counter", name, value, "", "", "", "", "", ""])
+                for name, value in snapshot["gauges"].items():
+                    writer.writerow([ts, "gauge", name, value, "", "", "", "", "", ""])
+                for name, h in snapshot["timings"].items():
+                    writer.writerow([ts, "timing", name, "", h["count"]] + [f"{h[k]:.3f}" for k in ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")])
+        else:
+            tmp = path.with_name(f".{path.name}.tmp")
+            tmp.write_text(json.dumps(snapshot, indent=2), encoding="utf-8")
+            os.replace(tmp, path)
+
+
+# 캡처 스레드와 GUI 스레드가 동시에 처음 접근해도 하나만 생기도록 import 시점에 생성
+_default_metrics = Metrics()
+
+
+def default_metrics() -> Metrics:
+    """프로세스 공용 지표 저장소를 반환합니다."""
+    return _default_metrics
@@ -0,0 +1,77 @@
+"""Background result composition.
+
+최종 결과 합성을 GUI 스레드 밖에서 수행합니다. 먼저 화면 크기에 맞춘 저해상도 합성을
+바로 보내 미리보기를 띄우고, 이어서 원본 해상도 합성과 파일 저장을 진행합니다.
+"""
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from image_io import EncodeSettings, write_image
+from image_processor import ImageSource, load_image
+from templates import LayoutTemplate, render_template
+
+
+class ResultComposer(QObject):
+    """선택한 사진들을 템플릿에 맞춰 백그라운드에서 합성/저장하는 작업자.
+
+    시그널은 작업 스레드에서 발생하지만 수신 객체가 GUI 스레드에 있으면 큐 연결로 전달됩니다.
+    수신 위젯이 먼저 닫혀도 연결만 끊기고 저장은 끝까지 진행됩니다.
+    """
+
+    preview_ready = pyqtSignal(object)  # 화면 크기에 맞춘 저해상도 합성 결과 (BGR ndarray)
+    composed = pyqtSignal(object)  # 원본 해상도 합성 결과 (BGR ndarray, 저장 전)
+    finished = pyqtSignal(str, bool)  # (결과 파일 경로, 성공 여부) - 성공이면 디스크에 확정된 상태
+
+    PREVIEW_INTERPOLATION = cv2.INTER_AREA  # 큰 폭으로 축소하므로 계단 현상이 적은 AREA
+    FINAL_INTERPOLATION = cv2.INTER_LANCZOS4  # 인쇄 품질
+
+    def __init__(self, template: LayoutTemplate, encoding: Optional[EncodeSettings] = None, parent=None):
+        super().__init__(parent)
+        self.template = template
+        self.encoding = encoding or EncodeSettings()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, sources: List[ImageSource], output_path: Path, preview_size: Optional[Tuple[int, int]] = None):
+        """합성을 시작합니다.
+
+        Args:
+            sources: 합성할 사진 (파일 경로 또는 BGR 배열, 템플릿 슬롯 순서)
+            output_path: 결과 파일 경로
+            preview_size: 미리보기를 표시할 영역 크기 (너비, 높이). None이면 미리보기 생략
+        """
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(list(sources), output_path, preview_size),
+            name="ResultComposer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """작업이 끝날 때까지 기다립니다. 끝났으면 True."""
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self, sources: List[ImageSource], output_path: Path, preview_size: Optional[Tuple[int, int]]):
+        success = False
+        try:
+            images = [load_image(source) for source in sources]
+            if preview_size is not None:
+                # 원본 해상도 합성을 기다리지 않고, 축소된 슬롯에 바로 리사이즈해 미리보기 생성
+                (width, height), _ = self.template.geometry((images[0].shape[1], images[0].shape[0]))
+                scale = min(preview_size[0] / width, preview_size[1] / height, 1.0)
+                preview = render_template(images, self.template, self.PREVIEW_INTERPOLATION, scale=scale)
+                self.preview_ready.emit(preview)
+
+            combined = render_template(images, self.template, self.FINAL_INTERPOLATION)
+            self.composed.emit(combined)
+            success = write_image(output_path, combined, self.encoding, durable=True)
+        except Exception as e:
+            print(f"이미지 합성 오류: {e}")
+        self.finished.emit(str(output_path), success)
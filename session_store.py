@@ -0,0 +1,223 @@
+"""Session storage.
+
+촬영 세션마다 ``captures/<날짜>/<세션 ID>/`` 디렉터리를 만들고, 세션 안에서 일어난 일
+(캡처 저장, 선택, 최종 결과)을 추가 전용 ``session.jsonl`` 매니페스트에 기록합니다.
+세션 시작/종료는 ``captures/index.jsonl`` 에도 한 줄씩 추가되므로 디렉터리를 훑지 않고
+세션 목록을 조회할 수 있습니다. 인덱스는 마지막으로 읽은 위치 이후에 추가된 줄만 읽고,
+세션 디렉터리는 세션 ID에 들어 있는 날짜로 바로 찾습니다.
+"""
+import json
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+MANIFEST_NAME = "session.jsonl"
+INDEX_NAME = "index.jsonl"
+
+
+def _append_line(path: Path, record: dict):
+    # O_APPEND로 한 번에 기록하므로 여러 프로세스가 같은 파일에 추가해도 줄이 섞이지 않음
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def _read_lines(path: Path) -> Iterator[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # 비정상 종료로 잘린 마지막 줄은 무시
+                    continue
+    except FileNotFoundError:
+        return
+
+
+class SessionLog:
+    """한 촬영 세션의 디렉터리와 추가 전용 매니페스트.
+
+    매니페스트의 경로는 세션 디렉터리 기준 상대 경로로 기록됩니다. 백그라운드 저장이 끝나지
+    않은 캡처가 있으면 ``close()`` 후에도 그 결과가 기록될 때까지 세션을 열어 둡니다.
+
+    Args:
+        store: 세션 저장소
+        session_id: 세션 ID (``YYYYMMDD_HHMMSS_<uuid 8자리>``)
+        directory: 세션 디렉터리
+    """
+
+    def __init__(self, store: "SessionStore", session_id: str, directory: Path):
+        self.store = store
+        self.id = session_id
+        self.directory = directory
+        self.manifest_path = directory / MANIFEST_NAME
+        self.closed = False
+        self._closing = False
+        self._lock = threading.Lock()
+        self._result: Optional[str] = None
+        self._pending: Set[str] = set()  # 저장 결과를 기다리는 캡처 (상대 경로)
+
+    def capture_path(self, index: int, extension: str) -> Path:
+        return self.directory / f"capture_{index:03d}{extension}"
+
+    def expect_capture(self, path: Path):
+        """백그라운드 저장을 시작한 캡처를 등록합니다 (``record_capture`` 전까지 세션 종료를 미룸)."""
+        with self._lock:
+            self._pending.add(self._relative(path))
+
+    def record(self, event: str, **fields):
+        """매니페스트에 이벤트 한 줄을 추가합니다."""
+        record = {"event": event, "time": datetime.now().isoformat(timespec="milliseconds"), **fields}
+        with self._lock:
+            if self.closed:
+                return
+            _append_line(self.manifest_path, record)
+
+    def record_capture(self, path: Path, success: bool = True):
+        relative = self._relative(path)
+        self.record("capture", path=relative, ok=success)
+        with self._lock:
+            self._pending.discard(relative)
+            finish = self._closing and not self._pending
+        if finish:
+            self._finish()
+
+    def record_selection(self, paths: Sequence[Path]):
+        self.record("selection", paths=[self._relative(p) for p in paths])
+
+    def record_result(self, path: Path, template: Optional[str] = None):
+        self._result = self._relative(path)
+        self.record("result", path=self._result, template=template)
+
+    def close(self):
+        """세션을 종료하고 전역 인덱스에 종료 기록을 추가합니다 (여러 번 호출해도 안전).
+
+        저장 중인 캡처가 남아 있으면 마지막 ``record_capture`` 에서 종료 기록을 남깁니다.
+        """
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+            if self._pending:
+                return
+        self._finish()
+
+    def _finish(self):
+        self.record("end")
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        self.store._append_index({"event": "end", "id": self.id, "result": self._result})
+
+    def events(self) -> List[dict]:
+        """매니페스트의 모든 이벤트를 읽습니다."""
+        return list(_read_lines(self.manifest_path))
+
+    def _relative(self, path: Path) -> str:
+        path = Path(path)
+        try:
+            return str(path.relative_to(self.directory))
+        except ValueError:
+            return str(path)
+
+
+class SessionStore:
+    """세션 디렉터리와 전역 세션 인덱스를 관리합니다.
+
+    Args:
+        root: 저장 루트 디렉터리 (기본: 현재 디렉터리의 ``captures``)
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else Path.cwd() / "captures"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / INDEX_NAME
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict] = {}  # 인덱스에서 읽은 세션 (시작 순서)
+        self._index_offset = 0  # 인덱스에서 이미 읽은 바이트 수
+
+    def create(self, template: Optional[str] = None) -> SessionLog:
+        """새 세션 디렉터리를 만들고 인덱스에 등록합니다.
+
+        하루 수천 개의 세션이 한 디렉터리에 쌓이지 않도록 날짜별 하위 디렉터리를 사용합니다.
+        """
+        now = datetime.now()
+        session_id = f"{now.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        directory = self.root / now.strftime("%Y%m%d") / session_id
+        directory.mkdir(parents=True)
+        session = SessionLog(self, session_id, directory)
+        session.record("start", template=template)
+        self._append_index({
+            "event": "start",
+            "id": session_id,
+            "path": str(directory.relative_to(self.root)),
+            "started": now.isoformat(timespec="seconds"),
+            "template": template,
+        })
+        return session
+
+    def sessions(self) -> List[Dict]:
+        """인덱스에서 세션 목록을 시작 순서대로 읽습니다 (디렉터리 탐색 없음).
+
+        이전 호출 이후 인덱스에 추가된 줄만 읽어 목록을 갱신합니다.
+
+        Returns:
+            ``{"id", "path", "started", "template", "ended", "result"}`` 딕셔너리 목록
+        """
+        with self._lock:
+            self._read_index()
+            return [dict(session) for session in self._sessions.values()]
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(0, 2)
+                if f.tell() < self._index_offset:
+                    # 인덱스가 교체/축소된 경우 처음부터 다시 읽음
+                    self._sessions.clear()
+                    self._index_offset = 0
+                f.seek(self._index_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # 기록 중인 마지막 줄(줄바꿈 없음)은 다음 호출에서 읽음
+        complete = data[:data.rfind(b"\n") + 1]
+        self._index_offset += len(complete)
+        for line in complete.decode("utf-8", errors="replace").splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # 비정상 종료로 잘린 줄은 무시
+                continue
+            session_id = record.get("id")
+            if record.get("event") == "start":
+                self._sessions[session_id] = {
+                    "id": session_id,
+                    "path": record.get("path"),
+                    "started": record.get("started"),
+                    "template": record.get("template"),
+                    "ended": False,
+                    "result": None,
+                }
+            elif record.get("event") == "end" and session_id in self._sessions:
+                self._sessions[session_id]["ended"] = True
+                self._sessions[session_id]["result"] = record.get("result")
+
+    def directory(self, session_id: str) -> Optional[Path]:
+        """세션 ID로 세션 디렉터리를 찾습니다 (ID의 날짜로 경로를 바로 계산, 인덱스 조회 없음)."""
+        directory = self.root / session_id[:8] / session_id
+        return directory if directory.is_dir() else None
+
+    def events(self, session: Dict) -> List[dict]:
+        """``sessions()`` 항목의 매니페스트 이벤트를 읽습니다."""
+        return list(_read_lines(self.root / session["path"] / MANIFEST_NAME))
+
+    def _append_index(self, record: dict):
+        _append_line(self.index_path, record)
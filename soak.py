@@ -0,0 +1,154 @@
+"""Session soak test.
+
+합성 프레임 소스로 촬영 세션(촬영 -> 자동 선택 -> 결과 합성 -> 세션 종료)을 수천 번
+반복하면서, 세션을 닫을 때마다 프로세스 RSS를 측정해 메모리가 계속 늘지 않는지 확인합니다.
+세션 디렉터리는 임시 저장소에 만들고 세션이 끝나면 바로 지웁니다. 세션이 끝날 때마다
+해시 색인과 세션 인덱스도 비우므로, 정상적으로 늘어나는 색인 항목이 누수를 가리지 않습니다.
+
+사용 예::
+
+    python main_app.py --soak 2000 --capture-format jpeg
+"""
+import gc
+import shutil
+import time
+from typing import List
+
+import numpy as np
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication
+
+from metrics import current_rss
+
+WARMUP_SESSIONS = 50  # 캐시/할당자가 안정될 때까지 기준 RSS 측정을 미룸
+RSS_TOLERANCE_MB = 32.0  # 기준 대비 허용하는 최대 RSS 증가량
+RSS_SLOPE_TOLERANCE_KB = 4.0  # 워밍업 이후 허용하는 세션당 RSS 증가 추세
+TREND_CHUNKS = 8
+REPORT_EVERY = 50
+FRAME_TIMEOUT_S = 2.0
+
+
+def _settle():
+    # deleteLater로 예약된 위젯 삭제까지 처리 (processEvents만으로는 처리되지 않음)
+    QApplication.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def _wait_for_new_frame(window, last_seq: int) -> int:
+    deadline = time.monotonic() + FRAME_TIMEOUT_S
+    while time.monotonic() < deadline:
+        QApplication.processEvents()
+        seq, frame = window.camera.latest()
+        if frame is not None and seq != last_seq:
+            window.current_frame = frame
+            return seq
+        time.sleep(0.001)
+    raise RuntimeError("프레임 소스에서 새 프레임이 오지 않습니다.")
+
+
+def run_session(window):
+    """세션 하나를 처음부터 끝까지 실행합니다 (카운트다운 대기 없음)."""
+    window.start_session()
+    seq = 0
+    for _ in range(window.MAX_CAPTURES):
+        seq = _wait_for_new_frame(window, seq)
+        window.capture_frame(auto=True)
+    window.capture_writer.flush()
+    QApplication.processEvents()
+
+    window.preselect_best()
+    if len(window.selected_frames) != window.SELECT_COUNT:
+        raise RuntimeError("자동 선택이 완료되지 않았습니다.")
+    dialog = window.open_result_dialog()
+    dialog.composer.wait()
+    QApplication.processEvents()  # 합성 완료 시그널 전달
+    if not dialog.download_button.isEnabled():
+        raise RuntimeError("결과 합성에 실패했습니다.")
+    window.capture_session.release_result()
+
+
+def rss_trend_kb(samples: np.ndarray) -> float:
+    """세션당 RSS 증가 추세 (KB).
+
+    샘플을 ``TREND_CHUNKS`` 구간으로 나눈 구간별 중앙값의 증가량 중 중앙값입니다. 할당자가 힙을
+    한 번 늘리는 계단형 증가는 한 구간 사이에만 나타나 무시되고(최대 증가량으로 따로 판정),
+    꾸준한 누수는 모든 구간 사이에서 나타납니다.
+    """
+    chunks = min(TREND_CHUNKS, len(samples) // 2)
+    if chunks < 2:
+        return 0.0
+    size = len(samples) // chunks
+    medians = [np.median(samples[i * size:(i + 1) * size]) for i in range(chunks)]
+    return float(np.median(np.diff(medians))) / size / 1024
+
+
+def _reset_indexes(window):
+    # 색인은 세션마다 항목이 늘어나는 것이 정상이므로 측정 대상에서 제외
+    window.hash_index.clear()
+    window.session_store.index_path.unlink(missing_ok=True)
+
+
+def run_soak(
+    window,
+    sessions: int,
+    tolerance_mb: float = RSS_TOLERANCE_MB,
+    slope_tolerance_kb: float = RSS_SLOPE_TOLERANCE_KB,
+) -> int:
+    """세션을 ``sessions`` 번 반복하고 RSS가 평평하게 유지되는지 확인합니다.
+
+    워밍업 이후의 최대 RSS 증가량과 세션당 증가 추세(``rss_trend_kb``)를 모두 확인하므로
+    마지막 샘플 하나가 우연히 낮아도 꾸준한 누수를 놓치지 않습니다.
+
+    Args:
+        window: 합성 프레임 소스로 연 ``PhotoBoothWindow`` (임시 세션 저장소 사용)
+        sessions: 반복할 세션 수
+        tolerance_mb: 워밍업 이후 기준 RSS 대비 허용하는 최대 증가량 (MB)
+        slope_tolerance_kb: 워밍업 이후 허용하는 세션당 RSS 증가 추세 (KB)
+
+    Returns:
+        종료 코드 (0: 통과, 1: 메모리 증가 또는 세션 버퍼 해제 누락)
+    """
+    warmup = min(WARMUP_SESSIONS, max(1, sessions // 5))
+    samples: List[int] = []
+    baseline = None
+    leaked = 0
+    start = time.perf_counter()
+    print(f"Soak: {sessions} sessions, warm-up {warmup}, tolerance {tolerance_mb:.0f} MB / {slope_tolerance_kb:.0f} KB per session")
+
+    for number in range(1, sessions + 1):
+        run_session(window)
+        session = window.capture_session
+        window.end_session()
+        _settle()
+
+        # 세션을 닫은 뒤에는 카메라 링 버퍼 외에 아무 버퍼도 남지 않아야 함
+        held = {name: value for name, value in window.memory_usage().items() if value and name != "camera_ring"}
+        if held:
+            leaked += 1
+            print(f"Session {number}: buffers not released after close: {held}")
+        shutil.rmtree(session.log.directory, ignore_errors=True)
+        _reset_indexes(window)
+
+        rss = current_rss()
+        samples.append(rss)
+        if number == warmup:
+            baseline = rss
+        if number % REPORT_EVERY == 0 or number == sessions:
+            growth = (rss - baseline) / 2**20 if baseline is not None else 0.0
+            rate = number / (time.perf_counter() - start)
+            print(f"[{number}/{sessions}] RSS {rss / 2**20:.1f} MB ({growth:+.1f} MB since warm-up), {rate:.1f} sessions/s")
+
+    after_warmup = np.array(samples[warmup - 1:], np.float64)
+    growth_mb = (after_warmup[-1] - baseline) / 2**20
+    peak_mb = (after_warmup.max() - baseline) / 2**20
+    slope_kb = rss_trend_kb(after_warmup)
+    print(
+        f"Soak finished after warm-up: RSS growth {growth_mb:+.1f} MB, peak {peak_mb:+.1f} MB, "
+        f"trend {slope_kb:+.2f} KB per session, {leaked} sessions with unreleased buffers"
+    )
+    if leaked or peak_mb > tolerance_mb or slope_kb > slope_tolerance_kb:
+        print("Soak FAILED")
+        return 1
+    print("Soak passed")
+    return 0
@@ -0,0 +1,36 @@
+"""Stylesheet helpers.
+
+전역 스타일시트(``assets/styles.qss``)를 읽고, 동적 속성으로 위젯 상태를 전환합니다.
+"""
+from pathlib import Path
+
+from PyQt5.QtWidgets import QWidget
+
+STYLESHEET_PATH = Path(__file__).resolve().parent / "assets" / "styles.qss"
+
+
+def load_stylesheet(path: Path = STYLESHEET_PATH) -> str:
+    """전역 스타일시트를 읽습니다. 파일이 없으면 빈 문자열을 반환합니다."""
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError as e:
+        print(f"스타일시트 로드 오류: {e}")
+        return ""
+
+
+def set_style_state(widget: QWidget, name: str, value) -> bool:
+    """동적 속성을 바꾸고 이미 파싱된 전역 스타일로 위젯을 다시 그립니다.
+
+    값이 같으면 아무것도 하지 않습니다.
+
+    Returns:
+        속성이 바뀌었으면 True
+    """
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+    return True
@@ -0,0 +1,205 @@
+"""Layout templates.
+
+결과 사진의 배치(슬롯 영역, 간격, 여백, 배경색, 장식 프레임 레이어)와 촬영/선택 장수를
+선언적으로 정의합니다. 3컷, 2x2, 4컷 등의 상품은 모두 같은 합성 경로를 사용합니다.
+
+템플릿 JSON 예시 (격자)::
+
+    {"name": "2x2", "title": "2x2", "rows": 2, "cols": 2, "margin": 40, "gutter": 20,
+     "capture_count": 8, "overlays": ["party"]}
+
+템플릿 JSON 예시 (직접 지정한 슬롯)::
+
+    {"name": "postcard", "canvas_size": [1800, 1200],
+     "slots": [[60, 60, 1000, 1080], [1120, 60, 620, 520], [1120, 620, 620, 520]]}
+"""
+import json
+import os
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from compositor import Rect, compose_slots
+from frame_registry import FrameRegistry, default_registry
+from metrics import default_metrics
+
+DEFAULT_TEMPLATE = "3cut"
+TEMPLATE_ENV_VAR = "PHOTOBOOTH_TEMPLATE"
+
+
+@dataclass(frozen=True)
+class LayoutTemplate:
+    """결과 사진 배치 템플릿.
+
+    ``slots`` 를 지정하지 않으면 ``rows`` x ``cols`` 격자로 배치합니다. 격자 칸 크기는
+    ``cell_size`` 이며, 없으면 첫 번째 사진 크기를 그대로 사용합니다 (원본 해상도 유지).
+
+    Attributes:
+        name: 템플릿 이름
+        title: 화면에 표시할 상품 이름
+        rows: 격자 행 수
+        cols: 격자 열 수
+        margin: 캔버스 바깥 여백 (px)
+        gutter: 칸 사이 간격 (px)
+        cell_size: 격자 칸 크기 (너비, 높이)
+        canvas_size: 직접 지정한 슬롯의 캔버스 크기 (너비, 높이)
+        slots: 직접 지정한 사진 영역 목록 (``canvas_size`` 좌표)
+        background: 슬롯 밖 배경색 (BGR)
+        overlays: 사진 위에 차례로 합성할 장식 프레임 (``assets/frames`` 이름 또는 경로)
+        capture_count: 촬영 장수
+    """
+
+    name: str
+    title: str = ""
+    rows: int = 3
+    cols: int = 1
+    margin: int = 0
+    gutter: int = 0
+    cell_size: Optional[Tuple[int, int]] = None
+    canvas_size: Optional[Tuple[int, int]] = None
+    slots: Tuple[Rect, ...] = ()
+    background: Tuple[int, int, int] = (255, 255, 255)
+    overlays: Tuple[str, ...] = ()
+    capture_count: int = 8
+
+    def __post_init__(self):
+        if self.slots and self.canvas_size is None:
+            raise ValueError(f"템플릿 '{self.name}': slots를 지정하려면 canvas_size가 필요합니다.")
+        if self.select_count < 1:
+            raise ValueError(f"템플릿 '{self.name}': 사진 영역이 없습니다.")
+        if self.capture_count < self.select_count:
+            raise ValueError(f"템플릿 '{self.name}': 촬영 장수가 선택 장수보다 적습니다.")
+
+    @property
+    def select_count(self) -> int:
+        """템플릿에 들어가는 사진 장수."""
+        return len(self.slots) if self.slots else self.rows * self.cols
+
+    @property
+    def display_name(self) -> str:
+        return self.title or self.name
+
+    def geometry(self, photo_size: Tuple[int, int], scale: float = 1.0) -> Tuple[Tuple[int, int], List[Rect]]:
+        """캔버스 크기와 사진 영역 목록을 계산합니다.
+
+        Args:
+            photo_size: 첫 번째 사진 크기 (너비, 높이) - ``cell_size`` 가 없는 격자에서 사용
+            scale: 결과 배율 (미리보기용 축소 합성)
+
+        Returns:
+            ((캔버스 너비, 캔버스 높이), [사진 영역, ...])
+        """
+        (width, height), rects = self._geometry(photo_size)
+        if scale == 1.0:
+            return (width, height), rects
+        # 모서리 좌표를 반올림해 슬롯이 캔버스 밖으로 넘치지 않게 함
+        scaled = []
+        for x, y, w, h in rects:
+            x0, y0 = round(x * scale), round(y * scale)
+            scaled.append((x0, y0, max(1, round((x + w) * scale) - x0), max(1, round((y + h) * scale) - y0)))
+        return (max(1, round(width * scale)), max(1, round(height * scale))), scaled
+
+    def _geometry(self, photo_size: Tuple[int, int]) -> Tuple[Tuple[int, int], List[Rect]]:
+        if self.slots:
+            return tuple(self.canvas_size), list(self.slots)
+
+        cell_w, cell_h = self.cell_size or photo_size
+        rects = [
+            (self.margin + col * (cell_w + self.gutter), self.margin + row * (cell_h + self.gutter), cell_w, cell_h)
+            for row in range(self.rows)
+            for col in range(self.cols)
+        ]
+        width = 2 * self.margin + self.cols * cell_w + (self.cols - 1) * self.gutter
+        height = 2 * self.margin + self.rows * cell_h + (self.rows - 1) * self.gutter
+        return (width, height), rects
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LayoutTemplate":
+        """JSON에서 읽은 딕셔너리로 템플릿을 만듭니다 (리스트는 튜플로 변환)."""
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"알 수 없는 템플릿 항목: {', '.join(sorted(unknown))}")
+        values = dict(data)
+        for key in ("cell_size", "canvas_size", "background"):
+            if values.get(key) is not None:
+                values[key] = tuple(int(v) for v in values[key])
+        if "slots" in values:
+            values["slots"] = tuple(tuple(int(v) for v in rect) for rect in values["slots"])
+        if "overlays" in values:
+            values["overlays"] = tuple(values["overlays"])
+        return cls(**values)
+
+
+BUILTIN_TEMPLATES = {
+    "3cut": LayoutTemplate("3cut", "3-Cut", rows=3, cols=1),
+    "3cut-horizontal": LayoutTemplate("3cut-horizontal", "3-Cut", rows=1, cols=3),
+    "4cut": LayoutTemplate("4cut", "4-Cut", rows=4, cols=1, margin=40, gutter=20),
+    "2x2": LayoutTemplate("2x2", "2x2", rows=2, cols=2, margin=40, gutter=20),
+}
+
+
+def load_template(spec: Optional[Union[str, Path]] = None) -> LayoutTemplate:
+    """내장 템플릿 이름 또는 JSON 파일 경로로 템플릿을 엽니다.
+
+    Args:
+        spec: 템플릿 이름/경로. None이면 ``PHOTOBOOTH_TEMPLATE`` 환경 변수, 없으면 3컷
+
+    Returns:
+        레이아웃 템플릿
+    """
+    if spec is None:
+        spec = os.environ.get(TEMPLATE_ENV_VAR, DEFAULT_TEMPLATE)
+    if str(spec) in BUILTIN_TEMPLATES:
+        return BUILTIN_TEMPLATES[str(spec)]
+
+    path = Path(spec)
+    if not path.is_file():
+        raise ValueError(f"알 수 없는 템플릿입니다: {spec} (내장: {', '.join(BUILTIN_TEMPLATES)})")
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data.setdefault("name", path.stem)
+    return LayoutTemplate.from_dict(data)
+
+
+def render_template(
+    images: Sequence[np.ndarray],
+    template: LayoutTemplate,
+    interpolation: int = cv2.INTER_LANCZOS4,
+    out: Optional[np.ndarray] = None,
+    registry: Optional[FrameRegistry] = None,
+    scale: float = 1.0,
+) -> np.ndarray:
+    """템플릿에 사진들을 채우고 장식 프레임 레이어를 제자리에 합성합니다.
+
+    Args:
+        images: BGR 사진 배열 목록 (``template.select_count`` 장)
+        template: 레이아웃 템플릿
+        interpolation: 사진 리사이즈 보간법 (미리보기는 INTER_AREA/LINEAR로 빠르게)
+        out: 결과를 기록할 배열 (크기가 맞으면 재사용)
+        registry: 장식 프레임 레지스트리 (기본: ``assets/frames``)
+        scale: 결과 배율. 1보다 작으면 사진을 축소된 슬롯에 바로 리사이즈하므로
+            원본 해상도 합성 없이 미리보기를 만들 수 있음
+
+    Returns:
+        합성된 BGR 이미지
+    """
+    if len(images) != template.select_count:
+        raise ValueError(f"'{template.name}' 템플릿에는 사진 {template.select_count}장이 필요합니다.")
+    metrics = default_metrics()
+    canvas_size, rects = template.geometry((images[0].shape[1], images[0].shape[0]), scale)
+    with metrics.timer("composite.slots" if scale == 1.0 else "composite.preview"):
+        out = compose_slots(images, canvas_size, rects, template.background, interpolation, out)
+
+    if template.overlays:
+        registry = registry or default_registry()
+        for frame in template.overlays:
+            overlay = registry.overlay(frame, canvas_size)
+            if overlay is None:
+                print(f"장식 프레임을 찾을 수 없습니다: {frame}")
+                continue
+            with metrics.timer("composite.overlay"):
+                overlay.apply(out, out=out)
+    return out
@@ -0,0 +1,40 @@
+"""Thumbnail pyramid.
+
+캡처마다 한 번만 ``cv2.pyrDown`` 으로 축소 단계들을 만들어 두고, 썸네일/미리보기 등
+각 UI 소비자가 목표 크기 이상인 가장 작은 단계에서 싸게 최종 축소하도록 합니다.
+"""
+from typing import List
+
+import cv2
+import numpy as np
+
+from preview import fit_size
+
+
+class ThumbnailPyramid:
+    """프레임의 1/2, 1/4, ... 축소본 목록.
+
+    원본(1/1)은 포함하지 않습니다 - 원본은 ``FrameStore`` 가 메모리 예산에 따라 관리합니다.
+    """
+
+    MIN_SIZE = 96  # 가장 작은 단계의 긴 변이 이 값보다 작아지면 중단
+
+    def __init__(self, frame: np.ndarray, min_size: int = MIN_SIZE):
+        self.source_size = (frame.shape[1], frame.shape[0])
+        self.levels: List[np.ndarray] = []
+        level = frame
+        while max(level.shape[:2]) // 2 >= min_size:
+            level = cv2.pyrDown(level)
+            self.levels.append(level)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self.levels)
+
+    def level_for(self, width: int, height: int):
+        """목표 영역에 맞춘 크기 이상인 가장 작은 단계를 반환합니다 (없으면 None - 원본 필요)."""
+        out_w, out_h = fit_size(*self.source_size, width, height)
+        for level in reversed(self.levels):
+            if level.shape[1] >= out_w and level.shape[0] >= out_h:
+                return level
+        return None
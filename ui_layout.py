@@ -18,17 +18,23 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from camera import CaptureThread
+from frame_source import FrameSource, open_frame_source
+from session_store import SessionStore
+
 
 class PhotoBooth(QMainWindow):
-    def __init__(self):
+    def __init__(self, frame_source: FrameSource = None):
         super().__init__()
         self.setWindowTitle("Webcam Preview with Gallery")
         self.resize(1200, 720)
 
-        # webcam capture
-        self.capture = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-        if not self.capture.isOpened():
-            raise RuntimeError("Cannot open default webcam")
+        # webcam capture (capture thread owns the frame source)
+        if frame_source is None:
+            frame_source = open_frame_source()
+        self.camera = CaptureThread(frame_source)
+        self.camera.start()
+        self.current_frame = None
 
         # UI setup
         central = QWidget(self)
@@ -78,12 +84,11 @@ class PhotoBooth(QMainWindow):
 
         # storage for captured frames (optional)
         self.captured_frames = []
-        self.output_dir = Path.cwd() / "captures"
-        self.output_dir.mkdir(exist_ok=True)
+        self.session = SessionStore(Path.cwd() / "captures").create()
 
     def update_frame(self):
-        ok, frame = self.capture.read()
-        if not ok:
+        _, frame = self.camera.latest()
+        if frame is None:
             self.preview_label.setText("Failed to read frame")
             return
 
@@ -99,13 +104,13 @@ class PhotoBooth(QMainWindow):
         self.current_frame = frame
 
     def capture_frame(self):
-        if not hasattr(self, "current_frame"):
+        _, frame = self.camera.latest(copy=True)
+        if frame is None:
             return
 
-        frame = self.current_frame.copy()
         index = len(self.captured_frames) + 1
-        filename = self.output_dir / f"capture_{index:03d}.png"
-        cv2.imwrite(str(filename), frame)
+        filename = self.session.capture_path(index, ".png")
+        self.session.record_capture(filename, cv2.imwrite(str(filename), frame))
         self.captured_frames.append(filename)
 
         thumb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -136,9 +141,13 @@ class PhotoBooth(QMainWindow):
         cv2.imshow(path.name, frame)
 
     def closeEvent(self, event):
-        if self.capture.isOpened():
-            self.capture.release()
-        cv2.destroyAllWindows()
+        self.camera.stop()
+        self.session.close()
+        try:
+            cv2.destroyAllWindows()
+        except cv2.error:
+            # headless OpenCV 빌드에는 HighGUI 창 지원이 없음
+            pass
         super().closeEvent(event)
 
 